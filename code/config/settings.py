@@ -1,7 +1,6 @@
 import os
 from pathlib import Path
 from dotenv import load_dotenv
-from pathlib import Path
 
 load_dotenv()
 
@@ -18,9 +17,23 @@ class _Settings:
     MCP_SQL_TIMEOUT_MS = int(os.getenv("MCP_SQL_TIMEOUT_MS", "20000"))
     MCP_TCP_HOST = os.getenv("MCP_TCP_HOST", "127.0.0.1")
     MCP_TCP_PORT = int(os.getenv("MCP_TCP_PORT", "8765"))
+    # How long a successful/failed MCP health probe stays valid before the
+    # services re-test the connection (seconds).
+    MCP_HEALTH_TTL_S = float(os.getenv("MCP_HEALTH_TTL_S", "30"))
+    # TCP client connection pool: max concurrent connections and how many
+    # idle keep-alive sockets to retain between calls
+    MCP_POOL_MAX = int(os.getenv("MCP_POOL_MAX", "4"))
+    MCP_POOL_KEEPALIVE = int(os.getenv("MCP_POOL_KEEPALIVE", "4"))
+    # Wire format for the TCP client: "msgpack" (length-prefixed binary) or
+    # "json" (legacy newline-delimited). The server auto-detects per message.
+    MCP_WIRE_FORMAT = os.getenv("MCP_WIRE_FORMAT", "msgpack")
 
     LOGGING_APP_NAME: str = "ada"
 
+    # Persist full chart JSON to logs/charts/ for the evaluation pipeline;
+    # set to "0" in production to skip the serialization + disk write.
+    PERSIST_CHART_JSON = os.getenv("PERSIST_CHART_JSON", "1") == "1"
+
 
 SETTINGS = _Settings()
 
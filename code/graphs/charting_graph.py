@@ -38,3 +38,12 @@ def build_charting_graph():
     )
 
     return g.compile()
+
+
+# Compile once at import so callers share a single Pregel runtime instead of
+# paying graph construction + state-schema validation per call. Guarded so a
+# missing runtime environment at import time does not break test collection.
+try:
+    APP = build_charting_graph()
+except Exception:
+    APP = None
@@ -65,3 +65,12 @@ def build_data_extractor_graph():
     # )
 
     return g.compile()
+
+
+# Compile once at import so callers share a single Pregel runtime instead of
+# paying graph construction + state-schema validation per call. Guarded so a
+# missing runtime environment at import time does not break test collection.
+try:
+    APP = build_data_extractor_graph()
+except Exception:
+    APP = None
@@ -6,19 +6,16 @@ from nodes.pick_next_question_node import pick_next_question_node
 from nodes.run_extractor_node import run_extractor_node
 from nodes.accumulate_and_advance_node import accumulate_and_advance_node
 from nodes.run_render_chart_node import run_render_chart_node
+from nodes.process_questions_node import process_questions_node
 
 
 def has_more(state):
     return "pick_next" if state["current_idx"] < len(state["questions"]) else "done"
 
-def build_orchestrator_graph():
+def build_orchestrator_graph(concurrent: bool = True):
     g = StateGraph(AgenticOrchestratorState)
     g.add_node("run_parsing", run_parsing_node)
     g.add_node("init_loop", init_loop_node)
-    g.add_node("pick_next", pick_next_question_node)
-    g.add_node("run_extractor", run_extractor_node)
-    g.add_node("accumulate", accumulate_and_advance_node)
-    g.add_node("run_render_chart", run_render_chart_node)
 
     g.set_entry_point("run_parsing")
     # Conditional edge: if validation fails, end; else continue
@@ -27,6 +24,21 @@ def build_orchestrator_graph():
         lambda state: "init_loop" if state.get("is_valid", False) else END,
         {"init_loop": "init_loop", END: END}
     )
+
+    if concurrent:
+        # Fan out all questions at once; extraction + charting per question
+        # run concurrently inside process_questions_node.
+        g.add_node("process_questions", process_questions_node)
+        g.add_edge("init_loop", "process_questions")
+        g.add_edge("process_questions", END)
+        return g.compile()
+
+    # Legacy sequential loop: one question at a time
+    g.add_node("pick_next", pick_next_question_node)
+    g.add_node("run_extractor", run_extractor_node)
+    g.add_node("accumulate", accumulate_and_advance_node)
+    g.add_node("run_render_chart", run_render_chart_node)
+
     g.add_edge("init_loop", "pick_next")
     g.add_edge("pick_next", "run_extractor")
     g.add_edge("run_extractor", "run_render_chart")
@@ -34,3 +46,12 @@ def build_orchestrator_graph():
 
     g.add_conditional_edges("accumulate", has_more, {"pick_next": "pick_next", "done": END})
     return g.compile()
+
+
+# Compile once at import so callers share a single Pregel runtime instead of
+# paying graph construction + state-schema validation per call. Guarded so a
+# missing runtime environment at import time does not break test collection.
+try:
+    APP = build_orchestrator_graph()
+except Exception:
+    APP = None
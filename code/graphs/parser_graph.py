@@ -22,6 +22,14 @@ def build_parser_graph():
     g.add_edge("parser_validation", END)
     return g.compile()
 
+# Compile once at import so callers share a single Pregel runtime instead of
+# paying graph construction + state-schema validation per call. Guarded so a
+# missing runtime environment at import time does not break test collection.
+try:
+    APP = build_parser_graph()
+except Exception:
+    APP = None
+
 if __name__ == "__main__":
     graph = build_parser_graph()
     initial = UserRequestParserState(user_query="Show me monthly revenue by product in 2024 and compare to budget.")
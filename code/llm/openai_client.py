@@ -1,40 +1,104 @@
 from typing import List, Dict, Any, Optional
+import httpx
 from langchain_openai import ChatOpenAI
 import logging
 from config.settings import SETTINGS
 
+# Shared HTTP clients so every ChatOpenAI reuses the same keep-alive
+# connection pool instead of building its own (one TLS handshake per pool,
+# not per service instance).
+_HTTP_CLIENT = httpx.Client(limits=httpx.Limits(max_keepalive_connections=20))
+_HTTP_ASYNC_CLIENT = httpx.AsyncClient(limits=httpx.Limits(max_keepalive_connections=20))
+
+# One ChatOpenAI per (model, temperature, max_retries); services construct
+# OpenAIChatClient freely and still share the underlying LLM client.
+_LLM_CACHE: Dict[tuple, ChatOpenAI] = {}
+
+
 class OpenAIChatClient:
     def __init__(self, model: str, temperature: float = 0.0, max_retries: int = 3):
         self.model = model
-        self.llm = ChatOpenAI(model=model, temperature=temperature, max_retries=max_retries)
+        key = (model, temperature, max_retries)
+        llm = _LLM_CACHE.get(key)
+        if llm is None:
+            llm = _LLM_CACHE.setdefault(key, ChatOpenAI(
+                model=model,
+                temperature=temperature,
+                max_retries=max_retries,
+                http_client=_HTTP_CLIENT,
+                http_async_client=_HTTP_ASYNC_CLIENT,
+            ))
+        self.llm = llm
         self.log = logging.getLogger(SETTINGS.LOGGING_APP_NAME + ".services.llm")
+        # Bound after the first response whose usage shape we recognize, so
+        # subsequent calls skip the probe ladder in complete()
+        self._usage_extractor = None
+
+    # --- usage extraction shapes (one of these gets memoized per client) ---
+
+    @staticmethod
+    def _usage_from_usage_metadata(resp):
+        u = resp.usage_metadata
+        return (
+            u.get("input_tokens") or u.get("prompt_tokens"),
+            u.get("output_tokens") or u.get("completion_tokens"),
+            u.get("total_tokens"),
+        )
+
+    @staticmethod
+    def _usage_from_token_usage(resp):
+        tok = resp.response_metadata["token_usage"]
+        return (
+            tok.get("prompt_tokens") or tok.get("input_tokens"),
+            tok.get("completion_tokens") or tok.get("output_tokens"),
+            tok.get("total_tokens"),
+        )
+
+    @staticmethod
+    def _usage_from_usage_meta(resp):
+        tok = resp.response_metadata["usage"]
+        return (
+            tok.get("prompt_tokens") or tok.get("input_tokens"),
+            tok.get("completion_tokens") or tok.get("output_tokens"),
+            tok.get("total_tokens"),
+        )
+
+    def _extract_usage(self, resp):
+        """
+        Return (prompt_tokens, completion_tokens, total_tokens), memoizing the
+        first extraction shape that matches so later calls are one attribute
+        access plus three dict reads instead of the full probe ladder.
+        """
+        extractor = self._usage_extractor
+        if extractor is not None:
+            try:
+                return extractor(resp)
+            except Exception:
+                # Provider shape changed; fall through and re-probe
+                self._usage_extractor = None
+
+        usage = getattr(resp, "usage_metadata", None)
+        if isinstance(usage, dict) and usage:
+            self._usage_extractor = self._usage_from_usage_metadata
+            return self._usage_from_usage_metadata(resp)
+
+        meta = getattr(resp, "response_metadata", None)
+        if isinstance(meta, dict):
+            if isinstance(meta.get("token_usage"), dict):
+                self._usage_extractor = self._usage_from_token_usage
+                return self._usage_from_token_usage(resp)
+            if isinstance(meta.get("usage"), dict):
+                self._usage_extractor = self._usage_from_usage_meta
+                return self._usage_from_usage_meta(resp)
+
+        return (None, None, None)
 
     # Accepts LangChain BaseMessage[] from ChatPromptTemplate.format_messages(...)
     # Synchronous version
     def complete(self, messages: List[Any]) -> str:
         resp = self.llm.invoke(messages)
         # Try to extract and log usage tokens for evaluation (prompt/completion/total)
-        prompt_t: Optional[int] = None
-        compl_t: Optional[int] = None
-        total_t: Optional[int] = None
-
-        # LangChain AIMessage commonly carries usage in usage_metadata
-        usage = getattr(resp, "usage_metadata", None)
-        if isinstance(usage, dict):
-            prompt_t = usage.get("input_tokens") or usage.get("prompt_tokens")
-            compl_t = usage.get("output_tokens") or usage.get("completion_tokens")
-            total_t = usage.get("total_tokens")
-
-        # Some providers attach token usage under response_metadata
-        if prompt_t is None or compl_t is None or total_t is None:
-            meta = getattr(resp, "response_metadata", None)
-            if isinstance(meta, dict):
-                # OpenAI LC often records under token_usage
-                tok = meta.get("token_usage") or meta.get("usage")
-                if isinstance(tok, dict):
-                    prompt_t = prompt_t or tok.get("prompt_tokens") or tok.get("input_tokens")
-                    compl_t = compl_t or tok.get("completion_tokens") or tok.get("output_tokens")
-                    total_t = total_t or tok.get("total_tokens")
+        prompt_t, compl_t, total_t = self._extract_usage(resp)
 
         # Compute fallback total if missing
         if total_t is None and (prompt_t is not None or compl_t is not None):
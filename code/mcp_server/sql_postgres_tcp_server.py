@@ -1,7 +1,10 @@
 """
-TCP JSON server for SQL tools (Postgres).
+TCP server for SQL tools (Postgres).
 
-Protocol (newline-delimited JSON per request/response):
+Protocol (per request/response, two framings auto-detected per message):
+  - msgpack with a 4-byte big-endian length prefix (preferred; much faster
+    serialization for large result sets)
+  - newline-delimited JSON (legacy clients)
   Request:  {"tool": "sql.validate"|"sql.query"|"schema.introspect", "arguments": {...}}
   Response: {"ok": true, "result": {...}} or {"ok": false, "error": "..."}
 
@@ -20,12 +23,19 @@ from __future__ import annotations
 import asyncio
 import json
 import os
+import re
+import struct
 from typing import Any, Dict, List, Optional
 import datetime
 import decimal
 
 import asyncpg
 
+try:
+    import msgpack  # C-level packing; avoids per-row JSON string work
+except ImportError:  # pragma: no cover - optional; JSON framing still works
+    msgpack = None
+
 import dotenv
 
 dotenv.load_dotenv()
@@ -50,12 +60,15 @@ DISALLOWED = (
 )
 
 
+# Single compiled scan instead of one substring pass per keyword. The word
+# boundaries also stop identifiers like "created_at" from tripping the
+# "create" check, which previously blocked legitimate queries.
+_DISALLOWED_RE = re.compile(r"\b(" + "|".join(DISALLOWED) + r")\b", re.IGNORECASE)
+
+
 def _is_disallowed(sql: str) -> Optional[str]:
-    s = sql.strip().lower()
-    for bad in DISALLOWED:
-        if bad in s:
-            return bad
-    return None
+    m = _DISALLOWED_RE.search(sql)
+    return m.group(1).lower() if m else None
 
 
 def _enforce_limit(sql: str, requested_limit: Optional[int], max_rows: int) -> str:
@@ -65,50 +78,88 @@ def _enforce_limit(sql: str, requested_limit: Optional[int], max_rows: int) -> s
     return f"SELECT * FROM ( {sql} ) AS sub LIMIT {limit}"
 
 
+_POOL: Optional[asyncpg.Pool] = None
+_POOL_LOCK = asyncio.Lock()
+
+
 async def _get_pool() -> asyncpg.Pool:
-    global _POOL  # type: ignore
-    try:
-        return _POOL  # type: ignore
-    except NameError:
-        _POOL = await asyncpg.create_pool(PG_DSN)  # type: ignore
-        return _POOL  # type: ignore
+    global _POOL
+    if _POOL is not None:
+        return _POOL
+    # Lock so concurrent first requests don't each bootstrap (and leak) a
+    # pool; min_size pre-warms connections so the first real query skips the
+    # TLS+auth handshake.
+    async with _POOL_LOCK:
+        if _POOL is None:
+            # statement_timeout is applied as a connection GUC so queries
+            # don't pay an extra SET round-trip each; command_timeout is the
+            # client-side guard for the same window.
+            _POOL = await asyncpg.create_pool(
+                PG_DSN,
+                min_size=2,
+                max_size=10,
+                command_timeout=DEFAULT_TIMEOUT_MS / 1000,
+                server_settings={"statement_timeout": str(DEFAULT_TIMEOUT_MS)},
+            )
+        return _POOL
 
 
 async def _run_explain(pool: asyncpg.Pool, sql: str, timeout_ms: int) -> None:
     async with pool.acquire() as conn:
-        await conn.execute(f"SET statement_timeout = {int(timeout_ms)}")
         await conn.fetch("EXPLAIN " + sql)
 
 
-async def _run_query(
-    pool: asyncpg.Pool, sql: str, params: Optional[List[Any]], timeout_ms: int
-) -> List[Dict[str, Any]]:
-    async with pool.acquire() as conn:
-        await conn.execute(f"SET statement_timeout = {int(timeout_ms)}")
-        rows = await conn.fetch(sql, *(params or []))
-        def _to_jsonable(v: Any) -> Any:
-            if isinstance(v, (str, int, float, bool)) or v is None:
-                return v
-            if isinstance(v, (datetime.date, datetime.datetime)):
-                # Use ISO 8601 for dates/times
-                return v.isoformat()
-            if isinstance(v, decimal.Decimal):
-                # Convert to float; if NaN/Inf, fall back to string
-                try:
-                    f = float(v)
-                    if f != f or f in (float('inf'), float('-inf')):
-                        return str(v)
-                    return f
-                except Exception:
-                    return str(v)
-            # Fallback to string for any unknown types
+def _to_jsonable(v: Any) -> Any:
+    if isinstance(v, (str, int, float, bool)) or v is None:
+        return v
+    if isinstance(v, (datetime.date, datetime.datetime)):
+        # Use ISO 8601 for dates/times
+        return v.isoformat()
+    if isinstance(v, decimal.Decimal):
+        # Convert to float; if NaN/Inf, fall back to string
+        try:
+            f = float(v)
+            if f != f or f in (float('inf'), float('-inf')):
+                return str(v)
+            return f
+        except Exception:
             return str(v)
+    # Fallback to string for any unknown types
+    return str(v)
+
 
-        out: List[Dict[str, Any]] = []
-        for r in rows:
-            d = dict(r)
-            out.append({k: _to_jsonable(v) for k, v in d.items()})
-        return out
+async def _run_query(
+    pool: asyncpg.Pool,
+    sql: str,
+    params: Optional[List[Any]],
+    timeout_ms: int,
+    columnar: bool = False,
+) -> Any:
+    async with pool.acquire() as conn:
+        # Stream rows through a prepared-statement cursor instead of fetch():
+        # peak memory is one output list rather than asyncpg Records plus a
+        # second list of dicts.
+        async with conn.transaction():
+            if timeout_ms != DEFAULT_TIMEOUT_MS:
+                # Per-query override; SET LOCAL reverts at transaction end
+                await conn.execute(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+            stmt = await conn.prepare(sql)
+            cursor = stmt.cursor(*(params or []))
+            if columnar:
+                # SoA layout: column names once, rows as plain value lists.
+                # Roughly halves wire bytes on wide result sets and feeds
+                # DataFrame construction directly.
+                columns: Optional[List[str]] = None
+                data: List[List[Any]] = []
+                async for row in cursor:
+                    if columns is None:
+                        columns = list(row.keys())
+                    data.append([_to_jsonable(v) for v in row])
+                return {"columns": columns or [], "data": data}
+            out: List[Dict[str, Any]] = []
+            async for row in cursor:
+                out.append({k: _to_jsonable(v) for k, v in row.items()})
+            return out
 
 
 async def _introspect(pool: asyncpg.Pool) -> Dict[str, Any]:
@@ -161,10 +212,15 @@ async def _handle_request(payload: Dict[str, Any]) -> Dict[str, Any]:
             params = args.get("params") or []
             limit = args.get("limit")
             timeout_ms = int(args.get("timeout_ms") or DEFAULT_TIMEOUT_MS)
+            # Clients may opt into columnar results with arguments.format="columns"
+            columnar = args.get("format") == "columns"
             safe_sql = _enforce_limit(query, limit, DEFAULT_MAX_ROWS)
             try:
-                rows = await _run_query(pool, safe_sql, params, timeout_ms)
-                return {"ok": True, "result": {"rows": rows, "rowcount": len(rows)}}
+                result = await _run_query(pool, safe_sql, params, timeout_ms, columnar=columnar)
+                if columnar:
+                    result["rowcount"] = len(result["data"])
+                    return {"ok": True, "result": result}
+                return {"ok": True, "result": {"rows": result, "rowcount": len(result)}}
             except Exception as e:
                 return {"ok": True, "result": {"rows": [], "rowcount": 0, "error": str(e)}}
 
@@ -180,20 +236,57 @@ async def _handle_request(payload: Dict[str, Any]) -> Dict[str, Any]:
 
 async def handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
     addr = writer.get_extra_info("peername")
+
+    def _send_json(resp: Dict[str, Any]) -> None:
+        writer.write((json.dumps(resp) + "\n").encode("utf-8"))
+
+    def _send_msgpack(resp: Dict[str, Any]) -> None:
+        # default=str covers any value _to_jsonable left untouched
+        body = msgpack.packb(resp, use_bin_type=True, default=str)
+        writer.write(struct.pack(">I", len(body)) + body)
+
     try:
         while not reader.at_eof():
-            line = await reader.readline()
-            if not line:
-                break
+            # Framing is detected per message: JSON requests start with "{",
+            # anything else is the first byte of a 4-byte length prefix.
             try:
-                payload = json.loads(line.decode("utf-8"))
-            except json.JSONDecodeError:
-                resp = {"ok": False, "error": "invalid json"}
-                writer.write((json.dumps(resp) + "\n").encode("utf-8"))
-                await writer.drain()
+                first = await reader.readexactly(1)
+            except asyncio.IncompleteReadError:
+                break
+            if first in (b"\n", b"\r"):
                 continue
-            resp = await _handle_request(payload)
-            writer.write((json.dumps(resp) + "\n").encode("utf-8"))
+
+            if first in (b"{", b"[", b" ", b"\t"):
+                # Legacy newline-delimited JSON framing
+                line = first + await reader.readline()
+                try:
+                    payload = json.loads(line.decode("utf-8"))
+                except json.JSONDecodeError:
+                    _send_json({"ok": False, "error": "invalid json"})
+                    await writer.drain()
+                    continue
+                resp = await _handle_request(payload)
+                _send_json(resp)
+            else:
+                if msgpack is None:
+                    _send_json({"ok": False, "error": "msgpack framing requires the msgpack package"})
+                    await writer.drain()
+                    break
+                try:
+                    header = first + await reader.readexactly(3)
+                    (length,) = struct.unpack(">I", header)
+                    body = await reader.readexactly(length)
+                except asyncio.IncompleteReadError:
+                    break
+                try:
+                    payload = msgpack.unpackb(body, raw=False)
+                except Exception:
+                    _send_msgpack({"ok": False, "error": "invalid msgpack"})
+                    await writer.drain()
+                    continue
+                resp = await _handle_request(payload)
+                _send_msgpack(resp)
+
             await writer.drain()
     finally:
         writer.close()
@@ -5,19 +5,23 @@ import json
 from .user_request_parser_model import DataQuestion, Filter, TimeRange
 
 # ---------- Helpers ----------
+_json_dumps = json.dumps  # pre-bound; _fmt_value runs once per filter value
+
+# Hoisted so _format_filter doesn't rebuild the dict per call
+_OP_MAP = {
+    "=": "=", "!=": "!=", ">": ">", "<": "<", ">=": ">=", "<=": "<=",
+    "in": "IN", "not_in": "NOT IN", "between": "BETWEEN", "like": "LIKE",
+}
+
 def _fmt_value(v: Union[str, float, int]) -> str:
     """Quote strings safely; keep numbers as-is."""
     if isinstance(v, str):
-        return json.dumps(v)
+        return _json_dumps(v)
     return str(v)
 
 def _format_filter(f: "Filter") -> str:
     """Format a Filter into a compact, SQL-like string for readability."""
-    op_map = {
-        "=": "=", "!=": "!=", ">": ">", "<": "<", ">=": ">=", "<=": "<=",
-        "in": "IN", "not_in": "NOT IN", "between": "BETWEEN", "like": "LIKE",
-    }
-    op = op_map.get(f.op, f.op)
+    op = _OP_MAP.get(f.op, f.op)
 
     if f.op in ("in", "not_in"):
         vals = f.value if isinstance(f.value, list) else [f.value]
@@ -61,7 +65,10 @@ class DataQuestionInfo(BaseModel):
         sort = q.sort or (f"-{q.metrics[0]}" if q.metrics else "")
         top_k = q.top_k if q.top_k is not None else 0
 
-        return cls(
+        # model_construct skips the validator pipeline: every field here comes
+        # straight out of an already-validated DataQuestion, so re-validation
+        # is pure overhead on the per-question hot path.
+        return cls.model_construct(
             kind=q.kind,
             original_text=q.original_text,
             metrics=list(q.metrics or []),
@@ -77,7 +84,8 @@ class DataQuestionInfo(BaseModel):
 
     @classmethod
     def from_many(cls, items: List["DataQuestion"]) -> List["DataQuestionInfo"]:
-        return [cls.from_dataquestion(it) for it in items if getattr(it, "kind", None) == "data"]
+        # isinstance is a C-level type check vs. a getattr + string compare
+        return [cls.from_dataquestion(it) for it in items if isinstance(it, DataQuestion)]
 
 # ---------- Example usage ----------
 # info = DataQuestionInfo.from_dataquestion(your_dataquestion_instance)
@@ -5,8 +5,11 @@ from config.settings import SETTINGS
 log = logging.getLogger(SETTINGS.LOGGING_APP_NAME + ".nodes.accumulate")
 
 def accumulate_and_advance_node(state: AgenticOrchestratorState) -> AgenticOrchestratorState:
-    processed = list(state.get("processed_questions", []))
+    # Append in place: copying the processed list every iteration made the
+    # loop O(N^2) across questions.
+    processed = state.get("processed_questions") or []
     processed.append(state["data_question"])
     next_idx = state["current_idx"] + 1
     log.info("Advance: processed=%d next_idx=%d", len(processed), next_idx)
-    return {**state, "processed_questions": processed, "current_idx": next_idx}
+    # Partial update; LangGraph merges the delta into state
+    return {"processed_questions": processed, "current_idx": next_idx}
@@ -4,8 +4,7 @@ from typing import List, Dict, Any
 from states.charting_state import ChartingState
 from services.charting_service_llm import ChartingServiceLLM
 from config.settings import SETTINGS
-
-import json
+from utils import fast_json
 
 log = logging.getLogger(SETTINGS.LOGGING_APP_NAME + ".nodes.render_chart")
 
@@ -19,6 +18,7 @@ def make_render_chart_llm_node_no_validation(service_llm: ChartingServiceLLM):
         if dq is None:
             log.warning("No DataQuestion found in state.")
             plotly_fig_json = None
+            narrative = ""
         else:
             log.info("Rendering chart with LLM for DataQuestion: %s", getattr(dq, "original_text", ""))
             previous_validation_errors = state.get("validation_error", "None")
@@ -30,15 +30,24 @@ def make_render_chart_llm_node_no_validation(service_llm: ChartingServiceLLM):
             #    "narrative": "<plain-text analysis>"
             #    }
             # Extract the plotly_figure and narrative
-            try:
-                resp_dict = json.loads(resp)
+            plotly_fig_json = None
+            narrative = ""
+            if isinstance(resp, dict):
+                # Client already returned parsed structured output; no JSON
+                # round-trip needed.
+                resp_dict = resp
+            else:
+                try:
+                    resp_dict = fast_json.loads(resp)
+                except ValueError as e:  # covers both orjson and stdlib decode errors
+                    log.error(f"Failed to decode JSON response from LLM: {e}")
+                    resp_dict = None
+            if resp_dict:
                 plotly_fig_json = resp_dict.get("plotly_figure", None)
                 narrative = resp_dict.get("narrative", "")
-            except json.JSONDecodeError as e:
-                log.error(f"Failed to decode JSON response from LLM: {e}")
-                plotly_fig_json = None
         
-        return {**state, "plotly_fig_json": plotly_fig_json, "narrative": narrative}
+        # Partial update; LangGraph merges the delta into state
+        return {"plotly_fig_json": plotly_fig_json, "narrative": narrative}
     return node
 
 
@@ -1,8 +1,8 @@
 import logging
 from states.charting_state import ChartingState
 from services.charting_service_llm import ChartingServiceLLM
-import json
 from config.settings import SETTINGS
+from utils import fast_json
 from utils.agent_logging_json import get_current_test_id
 from pathlib import Path
 
@@ -12,16 +12,30 @@ def make_chart_validate_node(validator: ChartingServiceLLM):
 	def node(state: ChartingState) -> ChartingState:
 		log.info("Validating chart JSON...")
 		fig_json = state.get("plotly_fig_json", None)
-		preview = str(fig_json)[:1500] + ("... (truncated)" if fig_json and len(str(fig_json)) > 1500 else "")
-		log.info("Chart JSON preview (len=%d):\n%s", len(str(fig_json)) if fig_json else 0, preview)
-		# Emit full figure in a separate structured log line for evaluation (avoid truncation issues)
+		# Stringify once (str() on a large figure dict materializes tens of
+		# KB) and only when INFO logging is actually on.
+		if log.isEnabledFor(logging.INFO):
+			s = str(fig_json) if fig_json is not None else ""
+			n = len(s)
+			preview = s[:1500] + ("... (truncated)" if n > 1500 else "")
+			log.info("Chart JSON preview (len=%d):\n%s", n, preview)
+		# Parse once: fig_dict feeds validation, the structured log line and
+		# the on-disk copy, instead of the old parse -> dump -> parse cycle.
+		if isinstance(fig_json, dict):
+			fig_dict = fig_json
+		elif fig_json:
+			fig_dict = fast_json.loads(fig_json)
+		else:
+			fig_dict = None
+
+		# Emit full figure in a separate structured log line for evaluation
+		# (avoid truncation issues). Skipped entirely when INFO is off or
+		# chart persistence is disabled -- the dump alone is ~1ms on a 30KB
+		# figure.
 		try:
-			if isinstance(fig_json, dict):
-				full_json = json.dumps(fig_json)
-			else:
-				# Already a JSON string or repr; attempt to load then re-dump for normalization
-				loaded = json.loads(fig_json) if fig_json else None
-				full_json = json.dumps(loaded) if loaded is not None else None
+			full_json = None
+			if fig_dict is not None and SETTINGS.PERSIST_CHART_JSON and log.isEnabledFor(logging.INFO):
+				full_json = fast_json.dumps(fig_dict)
 			if full_json:
 				log.info("chart_full_json:%s", full_json)
 				# Option B: persist full figure JSON to logs/charts/<test_id>.json
@@ -39,11 +53,9 @@ def make_chart_validate_node(validator: ChartingServiceLLM):
 		except Exception as _e:
 			# Non-fatal; evaluator will fall back to preview
 			pass
-		if not isinstance(fig_json, dict):
-			fig_dict = json.loads(fig_json)  # fig_json is a string
-		else:
-			fig_dict = fig_json
 
+		# Partial update; LangGraph merges the delta into state
+		update = {}
 		try:
 			#is_valid = validator.validate_plotly_fig_json(fig_dict)
 			is_valid = validator.validate_chart(fig_dict)
@@ -52,9 +64,11 @@ def make_chart_validate_node(validator: ChartingServiceLLM):
 		except Exception as e:
 			is_valid = False
 			error = str(e)
-			state["validation_attempts"] = state.get("validation_attempts", 0) + 1
+			update["validation_attempts"] = state.get("validation_attempts", 0) + 1
 			log.info("Chart validation FAILED: %s", error)
-			log.info("Validation attempts: %d", state["validation_attempts"])
-		return {**state, "is_valid": is_valid, "validation_error": error}
+			log.info("Validation attempts: %d", update["validation_attempts"])
+		update["is_valid"] = is_valid
+		update["validation_error"] = error
+		return update
 	return node
 
@@ -1,6 +1,7 @@
 from typing import List
 import logging
 from states.agentic_orchestrator_state import AgenticOrchestratorState
+from models.user_request_parser_model import DataQuestion
 from config.settings import SETTINGS
 
 log = logging.getLogger(SETTINGS.LOGGING_APP_NAME + ".nodes.init_loop")
@@ -8,7 +9,21 @@ log = logging.getLogger(SETTINGS.LOGGING_APP_NAME + ".nodes.init_loop")
 def init_loop_node(state: AgenticOrchestratorState) -> AgenticOrchestratorState:
     # ensure `questions` and `analysis_requests` are present in state['parsed']
     parsed = state["parsed"]
-    dqs = [q for q in parsed.questions if q.__class__.__name__ == "DataQuestion"]
-    ars = [q for q in parsed.questions if q.__class__.__name__ == "AnalysisRequest"]
+    # Single pass over a type-keyed bucket table: type(q) is a C-level read
+    # and dict lookup on type objects is identity-hashed. Add new work-item
+    # classes (e.g. a future Forecast) as extra buckets.
+    dqs: List[DataQuestion] = []
+    ars: list = []
+    buckets = {DataQuestion: dqs.append}
+    add_ar = ars.append
+    for q in parsed.questions:
+        add = buckets.get(type(q))
+        if add is not None:
+            add(q)
+        elif q.__class__.__name__ == "AnalysisRequest":
+            # no AnalysisRequest class exists in-tree yet; match by name
+            add_ar(q)
     log.info("Init: %d DataQuestions, %d AnalysisRequests", len(dqs), len(ars))
-    return {**state, "questions": dqs, "analysis_requests": ars, "current_idx": 0, "processed_questions": []}
+    # Partial update: LangGraph merges returned keys into state, so
+    # nodes no longer copy the whole state dict per hop.
+    return {"questions": dqs, "analysis_requests": ars, "current_idx": 0, "processed_questions": []}
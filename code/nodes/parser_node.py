@@ -16,5 +16,6 @@ def make_user_request_parser_node(parser: UserRequestParsingService):
         log.info("Parse node: received user_query (len=%d)", len(uq))
         parsed = parser.parse(uq)
         log.info("Parse node: produced %d work items", len(parsed.questions))
-        return {**state, "parsed": parsed}
+        # Partial update; LangGraph merges the delta into state
+        return {"parsed": parsed}
     return node
@@ -15,8 +15,8 @@ def make_parser_validation_node():
         parsed = state.get("parsed")
         is_valid, validation_message = validator.validate_agent_output(parsed)
         log.info("Parser validation: is_valid=%s, message=%s", is_valid, validation_message)
+        # Partial update; LangGraph merges the delta into state
         return {
-            **state,
             "is_valid": is_valid,
             "validation_message": validation_message,
         }
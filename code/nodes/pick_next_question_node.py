@@ -5,10 +5,15 @@ log = logging.getLogger(SETTINGS.LOGGING_APP_NAME + ".nodes.pick_next")
 
 def pick_next_question_node(state: AgenticOrchestratorState) -> AgenticOrchestratorState:
     i = state["current_idx"]
-    dq = state["questions"][i]
+    questions = state["questions"]
+    dq = questions[i]
+    n = len(questions)
     progress = state.get("progress_messages", [])
-    progress.append(f"Processing question {i+1} of {len(state['questions'])}.")
-    progress.append(f"Extracting data for question {i+1} of {len(state['questions'])}.")
+    progress += [
+        f"Processing question {i+1} of {n}.",
+        f"Extracting data for question {i+1} of {n}.",
+    ]
     # Add detailed logging for the picked question
     log.info("Pick DQ #%d: metrics=%s dims=%s", i, getattr(dq, "metrics", None), getattr(dq, "dimensions", None))
-    return {**state, "data_question": dq, "progress_messages": progress}
+    # Partial update; LangGraph merges the delta into state
+    return {"data_question": dq, "progress_messages": progress}
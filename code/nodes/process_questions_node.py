@@ -0,0 +1,97 @@
+import asyncio
+import logging
+from states.agentic_orchestrator_state import AgenticOrchestratorState
+from nodes.run_extractor_node import run_extractor_node
+from nodes.run_render_chart_node import run_render_chart_node
+from models.data_extractor_model import DataQuestionInfo
+from services.sql_generation_service import SQLGenerationService, SQLGenerationInput
+from config.settings import SETTINGS
+
+log = logging.getLogger(SETTINGS.LOGGING_APP_NAME + ".nodes.process_questions")
+
+# Lazily constructed batch SQL generator (needs LLM credentials at first use)
+_SQL_GEN: SQLGenerationService | None = None
+
+
+def _get_sql_gen() -> SQLGenerationService:
+    global _SQL_GEN
+    if _SQL_GEN is None:
+        _SQL_GEN = SQLGenerationService()
+    return _SQL_GEN
+
+
+def _batch_generate_sql(state: AgenticOrchestratorState, questions) -> list:
+    """
+    Generate SQL for all questions in one structured LLM call.
+
+    Returns a list aligned with `questions` (None entries mean the extractor
+    subgraph generates that question's SQL itself, e.g. when the batch call
+    fails or returns a mismatched count).
+    """
+    if len(questions) < 2:
+        return [None] * len(questions)
+    try:
+        payloads = []
+        for dq in questions:
+            dq_info = DataQuestionInfo.from_dataquestion(dq)
+            payloads.append(SQLGenerationInput(
+                semantic=state["semantic"],
+                original_text=dq_info.original_text,
+                metrics=dq_info.metrics,
+                dimensions=dq_info.dimensions,
+                time_grain=dq_info.time_grain,
+                time_range=dq_info.time_range,
+                filters=dq_info.filters,
+                sort=dq_info.sort,
+                top_k=dq_info.top_k,
+            ))
+        return _get_sql_gen().generate_sql_batch(payloads)
+    except Exception as e:
+        log.warning("Batch SQL generation failed, falling back to per-question: %s", e)
+        return [None] * len(questions)
+
+
+def _process_one_question(state: AgenticOrchestratorState, dq, idx: int, pre_sql=None):
+    # Per-question sub-state; give each task its own progress list so
+    # concurrent tasks don't append into the shared one.
+    sub_state: AgenticOrchestratorState = {
+        **state,
+        "data_question": dq,
+        "current_idx": idx,
+        "pre_sql": pre_sql,
+        "progress_messages": [],
+    }
+    # Nodes return partial deltas; merge them into the local sub-state
+    sub_state.update(run_extractor_node(sub_state))
+    sub_state.update(run_render_chart_node(sub_state))
+    return sub_state["data_question"]
+
+
+async def _gather_questions(state: AgenticOrchestratorState):
+    # Each question's SQL generation + validation + extraction + charting is
+    # an I/O-bound LLM/DB chain; fan them out so wall-clock time is
+    # max-of-question-latencies instead of their sum.
+    pre_sqls = _batch_generate_sql(state, state["questions"])
+    tasks = [
+        asyncio.to_thread(_process_one_question, state, dq, i, pre_sqls[i])
+        for i, dq in enumerate(state["questions"])
+    ]
+    return await asyncio.gather(*tasks)
+
+
+def process_questions_node(state: AgenticOrchestratorState) -> AgenticOrchestratorState:
+    questions = state.get("questions", [])
+    progress = state.get("progress_messages", [])
+    n = len(questions)
+    if not questions:
+        return {"processed_questions": [], "current_idx": 0}
+    progress.append(f"Processing {n} question(s) concurrently...")
+    processed = asyncio.run(_gather_questions(state))
+    progress.append(f"All {n} question(s) processed.")
+    log.info("Processed %d questions concurrently", len(processed))
+    # Partial update; LangGraph merges the delta into state
+    return {
+        "processed_questions": list(processed),
+        "current_idx": n,
+        "progress_messages": progress,
+    }
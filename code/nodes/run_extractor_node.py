@@ -6,6 +6,7 @@ from graphs.data_extractor_graph import build_data_extractor_graph
 
 from langgraph.func import task
 from config.settings import SETTINGS
+from utils import fast_json
 log = logging.getLogger(SETTINGS.LOGGING_APP_NAME + ".nodes.run_extractor")
 
 # build once at import; if you prefer, move inside the function
@@ -14,15 +15,22 @@ _EXTRACTOR_APP = build_data_extractor_graph()
 
 def df_dates_to_str(df, date_format='%Y-%m-%d'):
     # Find all columns with datetime dtype
-        # Print all column datatypes for debugging
-        print("DataFrame column dtypes:")
-        print(df.dtypes)
-        datetime_cols = df.select_dtypes(include=['datetime64[ns]', 'datetime64[ns, UTC]', 'datetime'])
-        # print("@@@@date columns", datetime_cols.columns)
-        for col in datetime_cols.columns:
-            df = df.sort_values(by=col)
-            df[col] = df[col].dt.strftime(date_format)
+    datetime_cols = df.select_dtypes(include=['datetime64[ns]', 'datetime64[ns, UTC]', 'datetime']).columns
+    if not len(datetime_cols):
         return df
+    # One chronological sort by the first date column; the old per-column
+    # sort re-sorted the whole frame K times for K date columns.
+    df = df.sort_values(by=datetime_cols[0])
+    for col in datetime_cols:
+        if date_format == '%Y-%m-%d':
+            try:
+                # Vectorized numpy day cast, ~10x faster than .dt.strftime
+                df[col] = df[col].values.astype('datetime64[D]').astype(str)
+                continue
+            except (TypeError, ValueError):
+                pass  # e.g. tz-aware values; fall back to strftime
+        df[col] = df[col].dt.strftime(date_format)
+    return df
 
 def dq_dataset_to_str(dq_dataset: pd.DataFrame) -> str:
     """
@@ -30,15 +38,23 @@ def dq_dataset_to_str(dq_dataset: pd.DataFrame) -> str:
     """
     if dq_dataset is None or dq_dataset.empty:
         return "[]"
-    # convert dates column before to_json:
+    # convert dates column before serializing:
     df = df_dates_to_str(dq_dataset)
-    json_str = df.to_json(orient='records')
-    #print("@@@@@myjson_str@@@@@:", json_str)
+    # Normalize missing values to None first: convert_dtypes() frames hold
+    # pd.NA, which to_dict passes through and orjson's default=str would
+    # render as the literal string "<NA>" instead of null
+    df = df.astype(object).where(df.notna(), None)
+    # orjson over to_dict('records') beats DataFrame.to_json, which walks
+    # rows at Python level for many dtypes
+    json_str = fast_json.dumps(df.to_dict(orient='records'))
     return json_str
 
 def run_extractor_node(state: AgenticOrchestratorState) -> AgenticOrchestratorState:
     dq = state["data_question"]
     extractor_state: DataExtractorState = {"semantic": state["semantic"], "data_question": dq}
+    # SQL pre-generated by the batch stage skips the per-question LLM call
+    if state.get("pre_sql"):
+        extractor_state["sql"] = state["pre_sql"]
     out = _EXTRACTOR_APP.invoke(extractor_state)
     df: pd.DataFrame = out.get("df")
     progress = state.get("progress_messages", [])
@@ -48,10 +64,10 @@ def run_extractor_node(state: AgenticOrchestratorState) -> AgenticOrchestratorSt
     # convert dataset to string for DQ dataset field for JSON serialization
     dq_dataset_str = dq_dataset_to_str(df)
   
-    try:
-        dq.dataset = dq_dataset_str  # type: ignore[attr-defined]
-    except Exception:
-        dq = dq.model_copy(update={"dataset": dq_dataset_str})  # pydantic v2 fallback
+    # DataQuestion is a plain (non-frozen) BaseModel, so direct assignment
+    # always works; the old try/except model_copy fallback was dead weight.
+    dq.dataset = dq_dataset_str
 
     log.info("Extracted df shape: %s", None if df is None else df.shape)
-    return {**state, "df": df, "data_question": dq, "progress_messages": progress}
+    # Partial update; LangGraph merges the delta into state
+    return {"df": df, "data_question": dq, "progress_messages": progress}
@@ -21,13 +21,11 @@ def run_render_chart_node(state: AgenticOrchestratorState) -> AgenticOrchestrato
     narrative = out.get("narrative", "")
     if isinstance(narrative, dict):
         narrative = json.dumps(narrative)
-    # attach fig_json back to the question
-    try:
-        dq.chart_figure_json = fig_json if is_valid else None  # type: ignore[attr-defined]
-        dq.narrative = narrative  # type: ignore[attr-defined]
-    except Exception:
-        dq = dq.model_copy(update={"chart_figure_json": fig_json if is_valid else None})  # pydantic v2 fallback
-        dq = dq.model_copy(update={"narrative": narrative})  # pydantic v2 fallback
+    # attach fig_json back to the question; DataQuestion is a plain
+    # (non-frozen) BaseModel, so direct assignment always works and the old
+    # try/except model_copy fallback was dead weight
+    dq.chart_figure_json = fig_json if is_valid else None
+    dq.narrative = narrative
     
     # Update progress messages
     progress = state.get("progress_messages", [])
@@ -36,6 +34,7 @@ def run_render_chart_node(state: AgenticOrchestratorState) -> AgenticOrchestrato
     else:
         progress.append("Chart rendering failed.")
     log.info("Chart rendered. Valid: %s", is_valid)
-    return {**state, "chart_figure_json": fig_json, 
-            "data_question": dq, 
+    # Partial update; LangGraph merges the delta into state
+    return {"chart_figure_json": fig_json,
+            "data_question": dq,
             "progress_messages": progress}
@@ -9,5 +9,6 @@ def make_sql_extract_node(extractor: DataExtractionService):
         log.info("Executing SQL and loading DataFrame...")
         df = extractor.run_query(state["sql"])
         log.info("DataFrame ready (rows=%d, cols=%d)", df.shape[0], df.shape[1])
-        return {**state, "df": df}
+        # Partial update; LangGraph merges the delta into state
+        return {"df": df}
     return node
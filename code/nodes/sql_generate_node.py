@@ -8,6 +8,11 @@ log = logging.getLogger(SETTINGS.LOGGING_APP_NAME + ".nodes.sql_generate")
 
 def make_sql_generate_node(gen: SQLGenerationService):
     def node(state: DataExtractorState) -> DataExtractorState:
+        # SQL may already be pre-generated by the batch stage; only call the
+        # LLM here when there is none yet or a validation error forces a redo.
+        if state.get("sql") and not state.get("validation_error"):
+            log.info("Using pre-generated SQL (len=%d)", len(state["sql"]))
+            return state
         # Convert DataQuestion to DataQuestionInfo and prepare SQLGenerationInput
         dq_info = DataQuestionInfo.from_dataquestion(state["data_question"])
         payload = SQLGenerationInput(
@@ -28,5 +33,6 @@ def make_sql_generate_node(gen: SQLGenerationService):
         )
         sql = gen.generate_sql(payload)
         log.info("SQL generated (len=%d)", len(sql))
-        return {**state, "sql": sql}
+        # Partial update; LangGraph merges the delta into state
+        return {"sql": sql}
     return node
@@ -10,16 +10,19 @@ def make_sql_validate_node(validator: SQLValidationService):
         log.info("Validating SQL...")
 
         sql = state.get("sql") or ""
-        # Truncate to keep logs manageable (tweak 1500 as you like)
-        preview = sql if len(sql) <= 1500 else sql[:1500] + f"... (truncated {len(sql)-1500} chars)"
-        log.info("Validating SQL (len=%d):\n%s", len(sql), preview)
+        if log.isEnabledFor(logging.INFO):
+            # Truncate to keep logs manageable (tweak 1500 as you like)
+            preview = sql if len(sql) <= 1500 else sql[:1500] + f"... (truncated {len(sql)-1500} chars)"
+            log.info("Validating SQL (len=%d):\n%s", len(sql), preview)
 
         is_valid, error = validator.validate(state["sql"])
+        # Partial update; LangGraph merges the delta into state
+        update = {"is_valid": is_valid, "validation_error": error}
         if is_valid:
             log.info("SQL validation PASSED")
         else:
-            state["validation_attempts"] = state.get("validation_attempts", 0) + 1
+            update["validation_attempts"] = state.get("validation_attempts", 0) + 1
             log.info("SQL validation FAILED: %s", error)
-            log.info("Validation attempts: %d", state["validation_attempts"])
-        return {**state, "is_valid": is_valid, "validation_error": error}
+            log.info("Validation attempts: %d", update["validation_attempts"])
+        return update
     return node
\ No newline at end of file
@@ -30,9 +30,21 @@ def chart_hint_to_dict(chart_hint: ChartHint) -> Dict[str, Any]:
     """
     Convert a ChartHint (Pydantic model) to a plain dictionary for LLM prompt consumption.
     Handles nested models and lists.
+
+    The dump is cached on the instance: validation retries rebuild the prompt
+    for the same ChartHint, and re-running the pydantic traversal each time
+    is wasted work.
     """
+    cached = getattr(chart_hint, "_cached_dump", None)
+    if cached is not None:
+        return cached
     if hasattr(chart_hint, "model_dump"):
-        return chart_hint.model_dump(by_alias=True, exclude_none=True)
+        d = chart_hint.model_dump(by_alias=True, exclude_none=True)
+        try:
+            object.__setattr__(chart_hint, "_cached_dump", d)
+        except Exception:
+            pass
+        return d
     elif isinstance(chart_hint, dict):
         return chart_hint
     else:
@@ -58,12 +70,19 @@ class ChartingServiceLLM:
             SETTINGS.CONFIG_YAML_PATH, "agent_charting"
         )
         self.user_prompt = USER_PROMPT
+        # System message never changes; build the dict once instead of per
+        # generate_chart call (retries rebuild messages up to 3x per question)
+        self._system_msg = {"role": "system", "content": self.system_prompt}
+        # Pre-bound hot-path callables: the validation loop re-enters
+        # build_prompt/generate_chart up to 3x per question
+        self._format = self.user_prompt.format
+        self._complete = self.client.complete
 
     def build_prompt(self, data_question: DataQuestion, previous_validation_errors: str= "None") -> str:
         chart_hint_dict = chart_hint_to_dict(data_question.chart_hint)
         
         dq_dataset = data_question.dataset if data_question.dataset else "[]"
-        user_message = self.user_prompt.format(
+        user_message = self._format(
             chart_hint=chart_hint_dict,
             previous_validation_errors=previous_validation_errors,
             dq_dataset=dq_dataset
@@ -79,7 +98,6 @@ class ChartingServiceLLM:
         Returns True if valid, raises ValueError if not.
         """
         result = validate_plotly_fig_json.invoke({"fig_json": fig_json})
-        print("PK Validation result:", result)
         log.info("Chart validation tool result: %s", result)
         if result.get("valid"):
             return True
@@ -94,11 +112,11 @@ class ChartingServiceLLM:
         prompt = self.build_prompt(data_question, previous_validation_errors=previous_validation_errors)
         log.info("Built prompt for chart generation %s", prompt)
         messages = [
-            {"role": "system", "content": self.system_prompt},
+            self._system_msg,
             {"role": "user", "content": prompt}
         ]
         log.info("Sending charting prompt to LLM (len=%d)", len(prompt))
-        resp = self.client.complete(messages)
+        resp = self._complete(messages)
         log.info("LLM returned charting response (len=%d)", len(resp))
         return resp
     
\ No newline at end of file
@@ -1,5 +1,13 @@
+import time
+
+import numpy as np
 import pandas as pd
 from sqlalchemy import text
+
+try:
+    import pyarrow as pa  # optional: columnar build path for MCP result rows
+except ImportError:
+    pa = None
 from tools.sqldb_sqlalchemy import get_sql_db
 from config.settings import SETTINGS
 from utils.mcp_client_tcp import get_tcp_mcp_sql_client_from_settings, MCPSQLClientTCP
@@ -9,6 +17,60 @@ log = logging.getLogger(SETTINGS.LOGGING_APP_NAME + ".services.data_extraction")
 
 _USE_MCP = True if SETTINGS.MCP_ENABLED == "1" else False
 
+_I_NAT = np.int64(np.datetime64("NaT").view("i8"))
+
+
+def _valid_datetime_count(converted: pd.Series) -> int:
+    """Counts non-NaT values on the raw int64 nanosecond view.
+
+    One C-level scan over the contiguous buffer instead of allocating a
+    boolean Series via notna(); on million-row result sets the difference is
+    visible. Falls back to notna() for dtypes without an i8 view (e.g.
+    object columns from mixed timezones).
+    """
+    try:
+        vals = converted.to_numpy(copy=False).view("i8")
+    except (TypeError, ValueError):
+        return int(converted.notna().sum())
+    return int(np.count_nonzero(vals != _I_NAT))
+
+
+def _is_already_datetime(series: pd.Series) -> bool:
+    """True for datetime64 columns and Arrow-backed timestamp columns.
+
+    Re-running to_datetime over either is redundant work (and for Arrow
+    timestamps in older pandas, a full element-wise re-conversion).
+    """
+    dtype = series.dtype
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return True
+    if pa is not None and isinstance(dtype, pd.ArrowDtype):
+        return pa.types.is_timestamp(dtype.pyarrow_dtype) or pa.types.is_date(dtype.pyarrow_dtype)
+    return False
+
+
+def _parse_date_like_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Converts date-named columns in place, shared by both extraction paths."""
+    for col in df.columns:
+        cl = str(col).lower()
+        if 'date' in cl or 'month' in cl or 'period' in cl:
+            series = df[col]
+            if _is_already_datetime(series):
+                continue
+            try:
+                # Single vectorized pass with the parse cache instead of
+                # the old per-element dateutil fallback path.
+                converted = pd.to_datetime(
+                    series, errors='coerce', utc=False, format='mixed', cache=True
+                )
+            except (TypeError, ValueError):
+                continue
+            # Accept only if nothing extra was coerced to NaT, so
+            # non-date strings in a "period"-named column survive intact.
+            if _valid_datetime_count(converted) == int(series.notna().sum()):
+                df[col] = converted
+    return df
+
 class DataExtractionService:
     """Data extraction service with optional MCP backend for read-only queries.
 
@@ -20,54 +82,93 @@ class DataExtractionService:
         self.uri = uri or SETTINGS.POSTGRES_URI
         self.mcp = mcp_client if mcp_client is not None else get_tcp_mcp_sql_client_from_settings()
         self.use_mcp = _USE_MCP
+        # (monotonic timestamp, ok) of the last MCP health probe
+        self._mcp_health: tuple[float, bool] | None = None
         log.info(f"DataExtractionService initialized. MCP enabled: {self.use_mcp}")
 
-    def _rows_to_df(self, rows: list[dict]) -> pd.DataFrame:
-        df = pd.DataFrame(rows)
-        # Infer better dtypes
-        df = df.convert_dtypes()
+    def _mcp_health_ok(self) -> bool:
+        """TTL-cached MCP health probe.
+
+        test_connection() is a full network round-trip; re-probing on every
+        query doubled per-query latency. The result is reused for
+        SETTINGS.MCP_HEALTH_TTL_S seconds before re-testing.
+        """
+        now = time.monotonic()
+        cached = self._mcp_health
+        if cached is not None and now - cached[0] <= SETTINGS.MCP_HEALTH_TTL_S:
+            return cached[1]
+        ok, _msg = self.mcp.test_connection()
+        self._mcp_health = (now, ok)
+        return ok
+
+    def _rows_to_df(self, rows: list[dict] | dict) -> pd.DataFrame:
+        # Accept either the row-oriented shape (list of dicts) or the server's
+        # columnar shape ({"columns": [...], "data": [[col values], ...]}).
+        if isinstance(rows, dict) and "columns" in rows:
+            # The server emits "data" row-major (one inner list per row)
+            df = pd.DataFrame(rows.get("data", []), columns=rows["columns"])
+            df = df.convert_dtypes()
+        elif rows and pa is not None:
+            # Arrow unifies per-column types in C and hands pandas typed
+            # contiguous buffers, so convert_dtypes is unnecessary here
+            df = pa.Table.from_pylist(rows).to_pandas()
+        elif rows:
+            # Reshape AoS -> SoA in one pass: per-column lists let pandas
+            # build each column directly instead of re-bucketing a dict per
+            # row internally.
+            columns: dict = {k: [] for k in rows[0]}
+            appends = {k: v.append for k, v in columns.items()}
+            for row in rows:
+                for k, append in appends.items():
+                    append(row.get(k))
+            df = pd.DataFrame(columns)
+            df = df.convert_dtypes()
+        else:
+            df = pd.DataFrame(rows)
         # Optionally, convert date-like columns
-        for col in df.columns:
-            cl = str(col).lower()
-            if 'date' in cl or 'month' in cl or 'period' in cl:
-                try:
-                    df[col] = pd.to_datetime(df[col])
-                except Exception:
-                    pass
-        return df
+        return _parse_date_like_columns(df)
 
     def run_query(self, sql: str) -> pd.DataFrame:
-        # Prefer MCP when available
-        # Check if MCP connection is available
-        test_conn_ok, test_conn_msg = self.mcp.test_connection()
-        if self.mcp is not None:
-            if self.use_mcp and test_conn_ok:
-                log.info("Running query via MCP sql.query...")
-                log.info("Running SQL: %s", sql)
-                resp = self.mcp.query(sql, params=None, limit=getattr(SETTINGS, "MCP_SQL_MAX_ROWS", None))
-                if "error" in resp and resp["error"]:
-                    log.error("MCP query error: %s", resp["error"])
-                    raise RuntimeError(f"MCP query error: {resp['error']}")
-                rows = resp.get("rows", [])
-                log.info("MCP query done (rows=%d)", len(rows))
-                return self._rows_to_df(rows)
-
-        # Fallback to SQLAlchemy direct execution
+        # Prefer MCP when available; the cached health probe only runs when a
+        # client exists and MCP is enabled (see _mcp_health_ok)
+        if self.mcp is not None and self.use_mcp and self._mcp_health_ok():
+            log.info("Running query via MCP sql.query...")
+            log.info("Running SQL: %s", sql)
+            resp = self.mcp.query(sql, params=None, limit=getattr(SETTINGS, "MCP_SQL_MAX_ROWS", None))
+            if "error" in resp and resp["error"]:
+                log.error("MCP query error: %s", resp["error"])
+                raise RuntimeError(f"MCP query error: {resp['error']}")
+            rows = resp.get("rows", [])
+            log.info("MCP query done (rows=%d)", len(rows))
+            return self._rows_to_df(rows)
+
+        # Fallback to SQLAlchemy direct execution. Go straight to the DB-API
+        # cursor: SQLAlchemy's Row/Mapping hydration plus a dict per row is
+        # pure overhead for a bulk fetch we immediately hand to pandas.
         log.info("Running query via SQLAlchemy fallback...")
         db = get_sql_db(self.uri)
         with db._engine.begin() as conn:
-            result = conn.execute(text(sql))
-            cols = list(result.keys())
-            rows = [dict(r) for r in result.mappings().all()]
-        df = pd.DataFrame(rows, columns=cols)
+            try:
+                raw = conn.connection.cursor()
+            except (AttributeError, NotImplementedError):
+                raw = None
+            if raw is not None:
+                try:
+                    raw.execute(sql)
+                    cols = [d[0] for d in raw.description]
+                    rows = raw.fetchall()
+                finally:
+                    raw.close()
+            else:
+                # Drivers without DB-API cursor passthrough: Row objects are
+                # already tuples, so feed them to from_records directly --
+                # no dict per row, no per-value hash lookup.
+                result = conn.execute(text(sql))
+                cols = list(result.keys())
+                rows = result.fetchall()
+        df = pd.DataFrame.from_records(rows, columns=cols)
         # Infer better dtypes and parse date-like columns
         df = df.convert_dtypes()
-        for col in df.columns:
-            cl = str(col).lower()
-            if 'date' in cl or 'month' in cl or 'period' in cl:
-                try:
-                    df[col] = pd.to_datetime(df[col])
-                except Exception:
-                    pass
+        df = _parse_date_like_columns(df)
         log.info("Query done (rows=%d, cols=%d)", len(rows), len(cols))
         return df
@@ -2,17 +2,23 @@
 from __future__ import annotations
 
 import logging
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, List, Tuple, Optional
 
-import yaml
 from langchain_core.prompts import ChatPromptTemplate
 from llm.openai_client import OpenAIChatClient
 from utils.prompt_loader import get_llm_config_from_yaml
 
 from config.settings import SETTINGS
 from utils.prompt_loader import build_system_prompt_from_yaml, get_llm_config_from_yaml
-from tools.user_parser_tools import alias_to_canonical, try_map_template
+from tools.user_parser_tools import (
+    alias_to_canonical_fn,
+    try_map_template_fn,
+    compile_registry_index,
+    compile_template_index,
+)
+from utils.yaml_cache import load_yaml_cached
 
 # Uses the same models you referenced
 from models.user_request_parser_model import (
@@ -29,19 +35,38 @@ ROOT_DIR = SETTINGS.ROOT_DIR
 SYSTEM_PROMPT = build_system_prompt_from_yaml(ROOT_DIR / "config" / "config.yaml" , "agent_parser")
 
 
+@lru_cache(maxsize=4)
+def _build_prompt(metrics: Tuple[str, ...], dimensions: Tuple[str, ...]) -> ChatPromptTemplate:
+    """
+    Composes the parser ChatPromptTemplate with the known metrics/dimensions
+    baked into the user message. Cached on the hint tuples so per-request
+    service construction reuses the same composed template.
+    """
+    user_prompt_with_metrics_and_dims = (
+        USER_PROMPT
+        + "\n\nKnown metrics: " + ", ".join(metrics)
+        + "\nKnown dimensions: " + ", ".join(dimensions)
+    )
+    return ChatPromptTemplate.from_messages([
+        ("system", "{system_prompt}"),
+        ("user", user_prompt_with_metrics_and_dims),
+    ])
+
+
 def _load_registry_and_templates() -> Tuple[dict, dict]:
     """
     Loads metrics registry (for alias mapping) and sql_templates mapping rules.
     Expect files at:
       ROOT_DIR/config/ag_user_query_parser_config/metrics.yaml
       ROOT_DIR/config/ag_user_query_parser_config/sql_templates.yaml
+
+    Loads go through the shared mtime/size-keyed YAML cache, so constructing
+    the service repeatedly does not re-read or re-parse unchanged files.
     """
     metrics_p = ROOT_DIR / "config" / "ag_user_query_parser_config" / "metrics.yaml"
     tmpls_p   = ROOT_DIR / "config" / "ag_user_query_parser_config" / "sql_templates.yaml"
-    with metrics_p.open("r", encoding="utf-8") as f:
-        reg = yaml.safe_load(f) or {}
-    with tmpls_p.open("r", encoding="utf-8") as f:
-        tmpls = yaml.safe_load(f) or {}
+    reg = load_yaml_cached(metrics_p)
+    tmpls = load_yaml_cached(tmpls_p)
     return reg, tmpls
 
 
@@ -79,38 +104,37 @@ class UserRequestParsingService:
         # Resolve base dir: agentic_data_assistant root if not given
         self.base_dir = project_root or SETTINGS.ROOT_DIR
         self.registry, self.tmpl_rules = _load_registry_and_templates()
-
-        user_prompt_with_metrics_and_dims = USER_PROMPT + "\n\nKnown metrics: " + ", ".join(self.registry.get("metrics", [])) + "\nKnown dimensions: " + ", ".join(self.registry.get("dimensions", []))
-
-        # Compose the prompt once; system text passed via variable
-        self.prompt = ChatPromptTemplate.from_messages([
-            ("system", "{system_prompt}"),
-            ("user", user_prompt_with_metrics_and_dims),
-        ])
+        # Warm the lookup indexes so _post_process lookups are O(1)
+        self._registry_index = compile_registry_index(self.registry)
+        self._tmpl_index = compile_template_index(self.tmpl_rules)
+
+        # Compose the prompt once per distinct registry; system text passed
+        # via variable
+        self.prompt = _build_prompt(
+            tuple(self.registry.get("metrics", [])),
+            tuple(self.registry.get("dimensions", [])),
+        )
+        # Bind structured output once: with_structured_output allocates a new
+        # Runnable + JSON-schema binding per call, and the composed chain is
+        # immutable given this configuration
+        self._structured_llm = self.client.llm.with_structured_output(AgentOutput)
+        self._chain = self.prompt | self._structured_llm
 
     def _post_process(self, parsed: AgentOutput) -> AgentOutput:
         updated: List[DataQuestion] = []
         for q in parsed.questions:
             if isinstance(q, DataQuestion):
-                # canonicalize metrics / dimensions
-                q.metrics = [
-                    alias_to_canonical.invoke({"word": m, "registry": self.registry})
-                    for m in q.metrics
-                ]
-                q.dimensions = [
-                    alias_to_canonical.invoke({"word": d, "registry": self.registry})
-                    for d in q.dimensions
-                ]
+                # canonicalize metrics / dimensions; the plain _fn forms skip
+                # the @tool .invoke validation/callback overhead per word
+                q.metrics = [alias_to_canonical_fn(m, self.registry) for m in q.metrics]
+                q.dimensions = [alias_to_canonical_fn(d, self.registry) for d in q.dimensions]
 
                 primary_metric = q.metrics[0] if q.metrics else None
                 group_cnt = len(q.dimensions)
 
-                q.template_id = try_map_template.invoke({
-                    "metric": primary_metric,
-                    "time_grain": q.time_grain,
-                    "group_by_cnt": group_cnt,
-                    "tmpl_rules": self.tmpl_rules,
-                })
+                q.template_id = try_map_template_fn(
+                    primary_metric, q.time_grain, group_cnt, self.tmpl_rules
+                )
                 updated.append(q)
             else:
                 updated.append(q)
@@ -128,11 +152,12 @@ class UserRequestParsingService:
 
         log.info("Parsing user query...")
 
-        chain = self.prompt | self.client.llm.with_structured_output(AgentOutput)
-        out: AgentOutput = chain.invoke(variables)
-        print(out)
+        out: AgentOutput = self._chain.invoke(variables)
         log.info("Parser LLM returned - %d work items", len(out.questions))
-        log.info("Parser LLM returned - %s", out.questions)
+        if log.isEnabledFor(logging.DEBUG):
+            # Building the pydantic repr walks every nested model; keep it
+            # off the INFO path
+            log.debug("Parser LLM returned - %s", out.questions)
 
         post = self._post_process(out)
         log.info("Post-processed items: %d", len(post.questions))
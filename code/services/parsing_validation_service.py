@@ -1,17 +1,17 @@
-import yaml
 from typing import List, Tuple
 from pathlib import Path
 from models.user_request_parser_model import AgentOutput, DataQuestion
 from config.settings import SETTINGS
+from utils.yaml_cache import load_yaml_cached
 import logging
 log = logging.getLogger(SETTINGS.LOGGING_APP_NAME + ".services.parsing_validation")
 
 class ParsingValidationService:
     def __init__(self, metrics_yaml_path: str):
-        with open(metrics_yaml_path, "r", encoding="utf-8") as f:
-            cfg = yaml.safe_load(f)
-        self.metrics = set(cfg.get("metrics", []))
-        self.dimensions = set(cfg.get("dimensions", []))
+        # Same metrics.yaml the parser loads; goes through the shared cache
+        cfg = load_yaml_cached(metrics_yaml_path)
+        self.metrics = frozenset(cfg.get("metrics", []))
+        self.dimensions = frozenset(cfg.get("dimensions", []))
         self.aliases = cfg.get("aliases", {})
 
     def validate_agent_output(self, agent_output: AgentOutput) -> Tuple[bool, str]:
@@ -19,22 +19,32 @@ class ParsingValidationService:
         Validates AgentOutput against metrics.yaml.
         Returns (is_valid, message). If not valid, message is user-facing.
         """
-        # Check for presence of DataQuestion
-        has_data_question = any(isinstance(q, DataQuestion) for q in agent_output.questions)
+        # Single pass collecting all three checks: DataQuestion presence,
+        # missing metric/dimension fields, and unknown names. The checks are
+        # then reported in the same precedence as before.
+        has_data_question = False
+        missing_fields = []
+        invalid_items = []
+        for idx, q in enumerate(agent_output.questions):
+            if not isinstance(q, DataQuestion):
+                continue
+            has_data_question = True
+            if not q.metrics or not q.dimensions:
+                missing = []
+                if not q.metrics:
+                    missing.append("metric")
+                if not q.dimensions:
+                    missing.append("dimension")
+                missing_fields.append((idx, missing, q.original_text))
+                continue
+            invalid_metrics = [m for m in q.metrics if m not in self.metrics]
+            invalid_dims = [d for d in q.dimensions if d not in self.dimensions]
+            if invalid_metrics or invalid_dims:
+                invalid_items.append((idx, invalid_metrics, invalid_dims, q.original_text))
+
         if not has_data_question:
             return False, "Sorry, I could not find any valid DataQuestion in your request. Please rephrase your query."
 
-        # Check that each DataQuestion has at least one metric and one dimension
-        missing_fields = []
-        for idx, q in enumerate(agent_output.questions):
-            if isinstance(q, DataQuestion):
-                if not q.metrics or not q.dimensions:
-                    missing = []
-                    if not q.metrics:
-                        missing.append("metric")
-                    if not q.dimensions:
-                        missing.append("dimension")
-                    missing_fields.append((idx, missing, q.original_text))
         if missing_fields:
             messages = []
             for idx, fields, text in missing_fields:
@@ -46,13 +56,6 @@ class ParsingValidationService:
                 messages.append(msg)
             return False, "\n".join(messages)
 
-        invalid_items = []
-        for idx, q in enumerate(agent_output.questions):
-            if isinstance(q, DataQuestion):
-                invalid_metrics = [m for m in q.metrics if m not in self.metrics]
-                invalid_dims = [d for d in q.dimensions if d not in self.dimensions]
-                if invalid_metrics or invalid_dims:
-                    invalid_items.append((idx, invalid_metrics, invalid_dims, q.original_text))
         if invalid_items:
             messages = []
             for idx, metrics, dims, text in invalid_items:
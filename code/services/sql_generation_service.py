@@ -1,8 +1,12 @@
+import hashlib
 import logging
+import threading
+import time
+from collections import OrderedDict
 from typing import Dict, Optional, Any
 from pathlib import Path
 import yaml
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from langchain_core.prompts import ChatPromptTemplate
 
 from llm.openai_client import OpenAIChatClient
@@ -34,7 +38,32 @@ Output should include:
 - sorted per the request
 """.strip()
 
+BATCH_USER_PROMPT = """
+SEMANTIC CONFIG (YAML):
+{semantic_yaml}
+
+REQUESTS (Data Questions):
+{requests}
+
+Return one SQL statement per request, in the same order as the requests.
+Each statement should include:
+- all requested dimensions
+- all requested metrics (aliased to their metric keys)
+- sorted per the request
+""".strip()
+
+
+class SQLBatchOutput(BaseModel):
+    """Structured output for batch SQL generation: one statement per request, in request order."""
+    sql_statements: list[str]
+
+
 class SQLGenerationInput(BaseModel):
+    # Frozen: instances are built once per question and never mutated, which
+    # lets pydantic skip per-field setter machinery and makes the payload
+    # safe to share across the caching layers keyed on its fields.
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     semantic: Dict
     original_text: str
     metrics: list[str]
@@ -46,32 +75,88 @@ class SQLGenerationInput(BaseModel):
     top_k: Optional[int] = None
     previous_validation_error: Optional[str] = None
 
+try:
+    from yaml import CSafeDumper as _SafeDumper  # LibYAML, C-accelerated
+except ImportError:
+    from yaml import SafeDumper as _SafeDumper
+
+# id(semantic dict) -> (dict, serialized YAML). The entry keeps a strong
+# reference to the keyed dict so its id cannot be recycled while cached, and
+# lookups verify identity before trusting the entry; the (slow, pure-Python-
+# emitter) dump still runs once per distinct config instead of per call.
+_SEMANTIC_YAML_CACHE: dict[int, tuple[Dict, str]] = {}
+
+
+def _semantic_to_yaml(semantic: Dict) -> str:
+    entry = _SEMANTIC_YAML_CACHE.get(id(semantic))
+    if entry is not None and entry[0] is semantic:
+        return entry[1]
+    s = yaml.dump(semantic, Dumper=_SafeDumper, sort_keys=False)
+    if len(_SEMANTIC_YAML_CACHE) >= 8:
+        _SEMANTIC_YAML_CACHE.clear()
+    _SEMANTIC_YAML_CACHE[id(semantic)] = (semantic, s)
+    return s
+
+
+_ESC_TABLE = str.maketrans({"{": "{{", "}": "}}"})
+
 def _esc_braces(s: str) -> str:
-    # Protect ChatPromptTemplate.format_messages from accidental `{` in YAML/text
-    return s.replace("{", "{{").replace("}", "}}")
+    # Protect ChatPromptTemplate.format_messages from accidental `{` in YAML/text.
+    # Single translate pass instead of two str.replace scans over the blob.
+    return s.translate(_ESC_TABLE)
+
+def _fmt_filter_dict(f: dict) -> str:
+    field = f.get("field")
+    op = f.get("op", "=")
+    val = f.get("value")
+    if isinstance(val, list):
+        vals = ", ".join(f"'{v}'" if isinstance(v, str) else str(v) for v in val)
+        val_str = f"({vals})"
+    elif isinstance(val, str):
+        val_str = f"'{val}'"
+    else:
+        val_str = str(val)
+    return f"{field} {op} {val_str}"
+
+
+# type -> formatter; replaces the isinstance ladder with one dict lookup
+_FILTER_FMT = {str: str, dict: _fmt_filter_dict}
+
+# Canonical payload tuple -> formatted base (system, user) messages; LRU
+# bounded in _base_messages
+_MESSAGES_CACHE: "OrderedDict[tuple, list]" = OrderedDict()
+
+# id(semantic dict) -> (dict, content hash); identity-checked like the YAML
+# cache above so a recycled id can never serve another config's hash
+_SEMANTIC_HASH_CACHE: dict[int, tuple[Dict, str]] = {}
+
+# Generated-SQL memoization: canonical payload tuple -> (monotonic ts, sql).
+# Repeated identical questions skip the LLM round-trip entirely.
+_SQL_RESULT_CACHE: "OrderedDict[tuple, tuple[float, str]]" = OrderedDict()
+_SQL_RESULT_LOCK = threading.Lock()
+_SQL_RESULT_TTL_S = 3600.0
+_SQL_RESULT_MAX = 512
+
+
+def _semantic_hash(semantic: Dict) -> str:
+    entry = _SEMANTIC_HASH_CACHE.get(id(semantic))
+    if entry is not None and entry[0] is semantic:
+        return entry[1]
+    h = hashlib.blake2b(_semantic_to_yaml(semantic).encode("utf-8"), digest_size=16).hexdigest()
+    if len(_SEMANTIC_HASH_CACHE) >= 8:
+        _SEMANTIC_HASH_CACHE.clear()
+    _SEMANTIC_HASH_CACHE[id(semantic)] = (semantic, h)
+    return h
+
 
 def _filters_to_str(filters: list[Any] | None) -> str:
+    # Unmemoized on purpose: filters may contain dicts (unhashable), and an
+    # id()-keyed cache can go stale when a freed list's id is reused.
+    # Formatting a handful of filters is cheap enough to redo per call.
     if not filters:
         return "[]"
-    out = []
-    for f in filters:
-        if isinstance(f, str):
-            out.append(f)
-        elif isinstance(f, dict):
-            field = f.get("field")
-            op = f.get("op", "=")
-            val = f.get("value")
-            if isinstance(val, list):
-                vals = ", ".join(f"'{v}'" if isinstance(v, str) else str(v) for v in val)
-                val_str = f"({vals})"
-            elif isinstance(val, str):
-                val_str = f"'{val}'"
-            else:
-                val_str = str(val)
-            out.append(f"{field} {op} {val_str}")
-        else:
-            out.append(str(f))
-    return ", ".join(out)
+    fmt = _FILTER_FMT.get
+    return ", ".join(fmt(type(f), str)(f) for f in filters)
 
 class SQLGenerationService:
     def __init__(self, client: Optional[OpenAIChatClient] = None):
@@ -97,21 +182,34 @@ class SQLGenerationService:
             ("user", USER_PROMPT),
         ])
 
-    def generate_sql(self, payload: SQLGenerationInput) -> str:
-        # Build the variables for ChatPromptTemplate
-        semantic_yaml = yaml.safe_dump(payload.semantic, sort_keys=False)
-        original_text = payload.original_text
-        if payload.previous_validation_error:
-            original_text += (
-                f"\n\nPrevious SQL validation error: "
-                f"{payload.previous_validation_error}\nPlease fix this."
-            )
+    def _base_messages(self, payload: SQLGenerationInput) -> list:
+        """Formats the (system, user) messages for a payload, cached by content.
 
-        # Fill messages using the SAME technique I had before using ChatPromptTemplate
+        Template substitution plus brace escaping re-runs over the large
+        semantic YAML on every call, but the base messages only depend on the
+        payload fields below -- retries differ solely in the validation error,
+        which generate_sql appends as a separate message.
+        """
+        key = (
+            # content hash, not id(): a recycled id must not alias two configs
+            _semantic_hash(payload.semantic),
+            payload.original_text,
+            tuple(payload.metrics),
+            tuple(payload.dimensions),
+            payload.time_grain,
+            payload.time_range,
+            _filters_to_str(payload.filters),
+            payload.sort,
+            payload.top_k,
+        )
+        cached = _MESSAGES_CACHE.get(key)
+        if cached is not None:
+            _MESSAGES_CACHE.move_to_end(key)
+            return cached
         messages = self.prompt.format_messages(
             system_prompt=self.system_prompt,
-            semantic_yaml=_esc_braces(semantic_yaml),
-            original_text=_esc_braces(original_text),
+            semantic_yaml=_esc_braces(_semantic_to_yaml(payload.semantic)),
+            original_text=_esc_braces(payload.original_text),
             metrics=", ".join(payload.metrics),
             dimensions=", ".join(payload.dimensions),
             time_grain=payload.time_grain or "none",
@@ -120,7 +218,50 @@ class SQLGenerationService:
             sort=payload.sort or "none",
             top_k=payload.top_k or 0,
         )
-        
+        _MESSAGES_CACHE[key] = messages
+        while len(_MESSAGES_CACHE) > 64:
+            _MESSAGES_CACHE.popitem(last=False)
+        return messages
+
+    def generate_sql(self, payload: SQLGenerationInput) -> str:
+        # Memoize final SQL on the same canonical key as the prompt cache,
+        # but only for first attempts -- the retry path must re-prompt.
+        cache_key = None
+        if not payload.previous_validation_error:
+            cache_key = (
+                _semantic_hash(payload.semantic),
+                payload.original_text,
+                tuple(payload.metrics),
+                tuple(payload.dimensions),
+                payload.time_grain,
+                payload.time_range,
+                _filters_to_str(payload.filters),
+                payload.sort,
+                payload.top_k,
+            )
+            now = time.monotonic()
+            with _SQL_RESULT_LOCK:
+                hit = _SQL_RESULT_CACHE.get(cache_key)
+                if hit is not None and now - hit[0] <= _SQL_RESULT_TTL_S:
+                    _SQL_RESULT_CACHE.move_to_end(cache_key)
+                    log.info("SQL cache hit (len=%d), skipping LLM call", len(hit[1]))
+                    return hit[1]
+
+        messages = self._base_messages(payload)
+        if payload.previous_validation_error:
+            # Retry path: only the error changes, so append it instead of
+            # re-rendering the whole prompt
+            messages = [
+                *messages,
+                {
+                    "role": "user",
+                    "content": (
+                        f"Previous SQL validation error: "
+                        f"{payload.previous_validation_error}\nPlease fix this."
+                    ),
+                },
+            ]
+
         ###### Uncomment to debug prompts #####
 
         # log.info("System messages: %r",  self.system_prompt)
@@ -137,4 +278,54 @@ class SQLGenerationService:
         resp = self.client.complete(messages)
         sql = resp.strip()
         log.info("LLM returned SQL (len=%d)", len(sql))
+        if cache_key is not None:
+            with _SQL_RESULT_LOCK:
+                _SQL_RESULT_CACHE[cache_key] = (time.monotonic(), sql)
+                while len(_SQL_RESULT_CACHE) > _SQL_RESULT_MAX:
+                    _SQL_RESULT_CACHE.popitem(last=False)
         return sql
+
+    def generate_sql_batch(self, payloads: list[SQLGenerationInput]) -> list[str]:
+        """
+        Generate SQL for several data questions in one structured LLM round-trip.
+
+        The semantic YAML is sent once for the whole batch instead of once per
+        question, and the N generate calls collapse into a single request.
+        Raises ValueError if the model does not return one statement per
+        request; callers fall back to per-question generate_sql.
+        """
+        if len(payloads) == 1:
+            return [self.generate_sql(payloads[0])]
+
+        semantic_yaml = _semantic_to_yaml(payloads[0].semantic)
+        blocks = []
+        for i, p in enumerate(payloads, 1):
+            blocks.append(
+                f"Request {i}:\n"
+                f"Original Text: {p.original_text}\n"
+                f"Metrics: {', '.join(p.metrics)}\n"
+                f"Dimensions: {', '.join(p.dimensions)}\n"
+                f"time_grain={p.time_grain or 'none'}\n"
+                f"time_range={p.time_range or 'none'}\n"
+                f"Filters: {_filters_to_str(p.filters)}\n"
+                f"Sort: {p.sort or 'none'}\n"
+                f"Top K: {p.top_k or 0}"
+            )
+
+        user_msg = BATCH_USER_PROMPT.format(
+            semantic_yaml=semantic_yaml,
+            requests="\n\n".join(blocks),
+        )
+        messages = [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": user_msg},
+        ]
+        structured = self.client.with_structured_output(SQLBatchOutput)
+        out = structured.invoke(messages)
+        sqls = [s.strip() for s in out.sql_statements]
+        log.info("LLM returned %d SQL statements for batch of %d", len(sqls), len(payloads))
+        if len(sqls) != len(payloads):
+            raise ValueError(
+                f"Batch SQL generation returned {len(sqls)} statements for {len(payloads)} requests"
+            )
+        return sqls
@@ -1,9 +1,9 @@
-import asyncio
 import logging
+import time
 from typing import Tuple, Optional, Dict
 
 from config.settings import SETTINGS
-from tools.postgres_validator_asyncpg import validate_sql
+from tools.postgres_validator_asyncpg import validate_sql_pooled
 from utils.mcp_client_tcp import get_tcp_mcp_sql_client_from_settings, MCPSQLClientTCP
 
 log = logging.getLogger(SETTINGS.LOGGING_APP_NAME + ".services.sql_validation_service")
@@ -21,27 +21,43 @@ class SQLValidationService:
         self.uri = (uri or SETTINGS.POSTGRES_URI)
         self.mcp = mcp_client if mcp_client is not None else get_tcp_mcp_sql_client_from_settings()
         self.use_mcp = _USE_MCP
+        # (monotonic timestamp, ok) of the last MCP health probe
+        self._mcp_health: tuple[float, bool] | None = None
+
+    def _mcp_health_ok(self) -> bool:
+        """TTL-cached MCP health probe; see DataExtractionService._mcp_health_ok.
+
+        Validation retries run this several times per question, so the probe
+        RTT is only paid once per SETTINGS.MCP_HEALTH_TTL_S window.
+        """
+        now = time.monotonic()
+        cached = self._mcp_health
+        if cached is not None and now - cached[0] <= SETTINGS.MCP_HEALTH_TTL_S:
+            return cached[1]
+        ok, _msg = self.mcp.test_connection()
+        self._mcp_health = (now, ok)
+        return ok
 
     def validate(self, sql: str) -> Tuple[bool, Optional[Dict]]:
-        # Prefer MCP when available
-        # Check if MCP connection is available
-        test_conn_ok, test_conn_msg = self.mcp.test_connection()
-        if self.mcp is not None:
-            if self.use_mcp and test_conn_ok:
-                log.info("Validating SQL via MCP...")
-                ok, msg = self.mcp.validate(sql)
-                if ok:
-                    log.info("Validation OK (MCP)")
-                    return True, None
-                else:
-                    log.warning("Validation failed (MCP): %s", msg)
-                    return False, {"message": msg}
+        # Prefer MCP when available; the cached health probe only runs when a
+        # client exists and MCP is enabled (see _mcp_health_ok)
+        if self.mcp is not None and self.use_mcp and self._mcp_health_ok():
+            log.info("Validating SQL via MCP...")
+            ok, msg = self.mcp.validate(sql)
+            if ok:
+                log.info("Validation OK (MCP)")
+                return True, None
+            else:
+                log.warning("Validation failed (MCP): %s", msg)
+                return False, {"message": msg}
 
         # Fallback to local asyncpg validator
         log.info("Validating SQL via asyncpg fallback...")
         if not self.uri:
             raise RuntimeError("POSTGRES_URI is not set")
         uri = self.uri.replace("postgresql+psycopg2://", "postgresql://")
-        ok, err = asyncio.run(validate_sql(uri, sql))
+        # Pooled path: reuses the shared background loop + asyncpg pool
+        # instead of a fresh event loop and TCP connect per call
+        ok, err = validate_sql_pooled(uri, sql)
         log.info("Validation result: %s", "OK" if ok else f"ERR {err}")
         return ok, err
\ No newline at end of file
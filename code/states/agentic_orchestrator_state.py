@@ -16,6 +16,7 @@ class AgenticOrchestratorState(UserRequestParserState, total=False):
 
     # Current work item + extractor output and charting output
     data_question: DataQuestion
+    pre_sql: Optional[str]  # SQL pre-generated by the batch stage, if any
     df: Optional[pd.DataFrame]
     # chart_figure_json: Optional[Dict[str, Any]]
     chart_figure_json: Optional[str]
@@ -1,3 +1,6 @@
+import asyncio
+import threading
+
 import asyncpg
 
 async def validate_sql(uri: str, sql: str) -> tuple[bool, dict | None]:
@@ -9,3 +12,59 @@ async def validate_sql(uri: str, sql: str) -> tuple[bool, dict | None]:
         return False, {"code": e.sqlstate, "message": e.message}
     finally:
         await conn.close()
+
+
+# --- Pooled variant -------------------------------------------------------
+# asyncio.run(validate_sql(...)) per call spins up a fresh event loop and a
+# fresh TCP connection for every validation attempt, which dominates latency
+# on the validation-retry loop. Instead we keep one background loop thread
+# alive for the process and an asyncpg pool per URI on it, so each validate
+# is a single prepare round-trip over a warm connection.
+
+_LOOP: asyncio.AbstractEventLoop | None = None
+_LOOP_LOCK = threading.Lock()
+_POOLS: dict[str, asyncpg.Pool] = {}
+_POOL_LOCK = asyncio.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    global _LOOP
+    with _LOOP_LOCK:
+        if _LOOP is None:
+            _LOOP = asyncio.new_event_loop()
+            threading.Thread(
+                target=_LOOP.run_forever, name="sql-validator-loop", daemon=True
+            ).start()
+    return _LOOP
+
+
+async def _get_pool(uri: str) -> asyncpg.Pool:
+    pool = _POOLS.get(uri)
+    if pool is None:
+        async with _POOL_LOCK:
+            pool = _POOLS.get(uri)
+            if pool is None:
+                # statement_cache_size=0: every validate prepares a distinct
+                # generated statement, so caching them on the long-lived pool
+                # connections would only grow server-side memory
+                pool = await asyncpg.create_pool(
+                    uri, min_size=1, max_size=4, statement_cache_size=0
+                )
+                _POOLS[uri] = pool
+    return pool
+
+
+async def _validate_via_pool(uri: str, sql: str) -> tuple[bool, dict | None]:
+    pool = await _get_pool(uri)
+    try:
+        async with pool.acquire() as conn:
+            await conn.prepare(sql)
+        return True, None
+    except asyncpg.PostgresError as e:
+        return False, {"code": e.sqlstate, "message": e.message}
+
+
+def validate_sql_pooled(uri: str, sql: str) -> tuple[bool, dict | None]:
+    """Synchronous entry point that validates over the shared pool/loop."""
+    loop = _get_loop()
+    return asyncio.run_coroutine_threadsafe(_validate_via_pool(uri, sql), loop).result()
@@ -1,6 +1,74 @@
 from langchain.tools import tool
 from typing import Optional
 
+# Lowercase word -> canonical name, built once per registry dict. The previous
+# implementation re-scanned aliases and re-lowercased the metric/dimension
+# lists on every call; the index makes each lookup a single dict get.
+# Keyed by id(registry): the registry comes from the YAML cache and lives for
+# the duration of the owning service, so identity is a stable key here.
+_REGISTRY_INDEX_CACHE: dict[int, dict[str, str]] = {}
+
+# (metric, time_grain, group_by_count) -> template_id, same identity-keyed
+# caching scheme as the registry index.
+_TEMPLATE_INDEX_CACHE: dict[int, dict[tuple, Optional[str]]] = {}
+
+
+def compile_registry_index(registry: dict) -> dict[str, str]:
+    """
+    Builds a lowercase lookup index over a metrics registry: every alias maps
+    to its canonical name, and every metric/dimension/canonical maps to itself.
+    """
+    cached = _REGISTRY_INDEX_CACHE.get(id(registry))
+    if cached is not None:
+        return cached
+    index: dict[str, str] = {}
+    for canon, syns in registry.get('aliases', {}).items():
+        index[canon.lower()] = canon
+        for s in syns:
+            index[s.lower()] = canon
+    for m in registry.get('metrics', []):
+        index.setdefault(m.lower(), m)
+    for d in registry.get('dimensions', []):
+        index.setdefault(d.lower(), d)
+    _REGISTRY_INDEX_CACHE[id(registry)] = index
+    return index
+
+
+def compile_template_index(tmpl_rules: dict) -> dict[tuple, Optional[str]]:
+    """
+    Builds a (metric, time_grain, group_by_count) -> template_id index over
+    the sql_templates rules, replacing the per-call linear scan.
+    """
+    cached = _TEMPLATE_INDEX_CACHE.get(id(tmpl_rules))
+    if cached is not None:
+        return cached
+    index: dict[tuple, Optional[str]] = {}
+    for rule in tmpl_rules.get('rules', []):
+        when = rule.get('when', {})
+        key = (when.get('metric'), when.get('time_grain'), when.get('group_by_count'))
+        # first matching rule wins, as in the old scan
+        index.setdefault(key, rule.get('template_id'))
+    _TEMPLATE_INDEX_CACHE[id(tmpl_rules)] = index
+    return index
+
+
+def alias_to_canonical_fn(word: str, registry: dict) -> str:
+    """Plain-function form of alias_to_canonical for internal hot paths.
+
+    The @tool wrapper adds pydantic argument validation and callback
+    bookkeeping per .invoke; services that already hold the registry should
+    call this directly.
+    """
+    return compile_registry_index(registry).get(word.lower(), word)
+
+
+def try_map_template_fn(metric: Optional[str], time_grain: Optional[str], group_by_cnt: int, tmpl_rules: dict) -> Optional[str]:
+    """Plain-function form of try_map_template for internal hot paths."""
+    if not metric:
+        return None
+    return compile_template_index(tmpl_rules).get((metric, time_grain, group_by_cnt))
+
+
 @tool
 def alias_to_canonical(word: str, registry: dict) -> str:
     """
@@ -11,15 +79,7 @@ def alias_to_canonical(word: str, registry: dict) -> str:
     Returns:
         The canonical name if found, otherwise returns the original word.
     """
-    aliases = registry.get('aliases', {})
-    for canon, syns in aliases.items():
-        if word.lower() == canon.lower() or word.lower() in [s.lower() for s in syns]:
-            return canon
-        if word.lower() in [m.lower() for m in registry.get('metrics', [])]:
-            return word
-        if word.lower() in [d.lower() for d in registry.get('dimensions', [])]:
-            return word
-    return word
+    return alias_to_canonical_fn(word, registry)
 
 @tool
 def try_map_template(metric: Optional[str], time_grain: Optional[str], group_by_cnt: int, tmpl_rules: dict) -> Optional[str]:
@@ -33,12 +93,4 @@ def try_map_template(metric: Optional[str], time_grain: Optional[str], group_by_
     Returns:
         The template ID if a matching rule is found, otherwise None.
     """
-    if not metric:
-        return None
-    for rule in tmpl_rules.get('rules', []):
-        when = rule.get('when', {})
-        if when.get('metric') == metric and when.get('time_grain') == time_grain and when.get('group_by_count') == group_by_cnt:
-            return rule.get('template_id')
-    return None
-
-
+    return try_map_template_fn(metric, time_grain, group_by_cnt, tmpl_rules)
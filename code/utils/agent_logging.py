@@ -29,31 +29,6 @@ def setup_logging(app_name: str = "data_assistant") -> logging.Logger:
     return logging.getLogger(app_name)
 
 
-def parse_escaped_string(s: str) -> str:
-    """
-    Convert a string containing literal escape sequences like '\\n' into
-    actual newlines so it logs with proper formatting.
-
-    Used mainly for LLM outputs that embed escaped characters.
-
-    Example:
-        raw = "Line1\\nLine2\\nLine3"
-        formatted = parse_escaped_string(raw)
-        logger.info(formatted)
-
-    Returns:
-        str: The string with real line breaks and escapes resolved.
-    """
-    import json, ast
-
-    text = s.strip()
-
-    # Try JSON decoding first (handles most escape sequences cleanly)
-    if (text.startswith('"') and text.endswith('"')) or (text.startswith("'") and text.endswith("'")):
-        try:
-            return json.loads(text)
-        except json.JSONDecodeError:
-            return ast.literal_eval(text)
-    else:
-        # Fallback: manually interpret standard escapes like \n, \t
-        return text.encode("utf-8").decode("unicode_escape")
+# Canonical implementation lives in agent_logging_json; re-exported here so
+# existing imports keep working without maintaining two diverging copies.
+from utils.agent_logging_json import parse_escaped_string  # noqa: F401,E402
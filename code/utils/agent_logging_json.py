@@ -1,13 +1,27 @@
+import atexit
+import codecs
 import contextvars
+import functools
 import logging
+import logging.handlers
 import json
+import queue
+import time
 import uuid
-from datetime import datetime, timezone
+
+try:
+    import orjson  # C-implemented JSON, 3-10x faster than stdlib on dicts
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
 from pathlib import Path
 from typing import Any, Dict, Optional
 
 import sys, os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_pkg_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _pkg_root not in sys.path:
+    # Guarded: repeated imports used to append duplicates, lengthening every
+    # subsequent import's path scan
+    sys.path.append(_pkg_root)
 
 from config.settings import SETTINGS
 
@@ -26,57 +40,279 @@ class JsonFormatter(logging.Formatter):
       - Includes exception info if present.
     """
 
-    STANDARD_KEYS = {
+    STANDARD_KEYS = frozenset({
         "name", "msg", "args", "levelname", "levelno", "pathname", "filename",
         "module", "exc_info", "exc_text", "stack_info", "lineno", "funcName",
         "created", "msecs", "relativeCreated", "thread", "threadName",
         "processName", "process", "stacklevel"
-    }
+    })
+
+    # Header keys emitted on every record; a dict message carrying one of
+    # these forces the slow (full-dict) serialization path so it can still
+    # override the header, as before.
+    HEADER_KEYS = frozenset({"timestamp", "level", "session_id", "logger"})
+
+    # Everything format() must not copy off the record: standard attributes,
+    # header names, and attributes some stdlib versions add ("taskName" on
+    # 3.12+, "message" when a handler pre-formats). Computed once so the
+    # extras extraction is a single C-level dict_keys - frozenset.
+    _SKIP_KEYS = STANDARD_KEYS | HEADER_KEYS | frozenset({"message", "taskName"})
 
     def __init__(self, session_id: str):
         super().__init__()
         self.session_id = session_id
+        # The session fragment never changes and logger names repeat; cache
+        # their escaped JSON forms so the constants are not re-escaped on
+        # every record.
+        self._session_fragment = json.dumps(session_id, ensure_ascii=False)
+        self._logger_fragments: Dict[str, str] = {}
+
+    @staticmethod
+    def _dumps(obj: Any) -> str:
+        if orjson is not None:
+            # default=str keeps parity with stdlib behavior for payloads
+            # carrying Paths, datetimes, etc.
+            return orjson.dumps(obj, default=str).decode()
+        return json.dumps(obj, ensure_ascii=False, default=str)
 
     def format(self, record: logging.LogRecord) -> str:
-        base: Dict[str, Any] = {
-            "timestamp": datetime.now(timezone.utc).isoformat(timespec="milliseconds") + "Z",
-            "level": record.levelname,
-            "session_id": self.session_id,
-            "logger": record.name,
-        }
+        extras: Dict[str, Any] = {}
+
+        message_str = None
 
         # 1) Merge dicts logged directly: logger.info({"event": "...", ...})
         if isinstance(record.msg, dict):
-            base.update(record.msg)
-            message_str = None
+            extras.update(record.msg)
         else:
-            # 2) Normal string messages; try to parse JSON text to merge
+            # 2) Normal string messages; only attempt the JSON parse when the
+            # first/last characters look like a JSON container -- the common
+            # case is plain text, and paying a full failed parse (plus the
+            # exception) per record adds up
             raw = record.getMessage()
-            try:
-                parsed = json.loads(raw)
-                if isinstance(parsed, dict):
-                    base.update(parsed)
-                    message_str = None
-                else:
-                    # JSON but not an object; keep under "message"
-                    message_str = parsed
-            except (json.JSONDecodeError, TypeError):
-                # Not JSON -> keep raw text (multi-line safe; will be escaped by json.dumps)
+            if raw and raw[0] in "{[" and raw[-1] in "}]":
+                try:
+                    # orjson parses and raises (for non-JSON text) several
+                    # times faster than stdlib; both decode errors are
+                    # ValueErrors
+                    parsed = orjson.loads(raw) if orjson is not None else json.loads(raw)
+                    if isinstance(parsed, dict):
+                        extras.update(parsed)
+                    else:
+                        # JSON but not an object; keep under "message"
+                        message_str = parsed
+                except (ValueError, TypeError):
+                    # Not JSON -> keep raw text (multi-line safe; will be
+                    # escaped by json.dumps)
+                    message_str = raw
+            else:
                 message_str = raw
 
         if message_str is not None:
-            base["message"] = message_str
+            extras["message"] = message_str
 
-        # 3) Merge extra fields from the record (added via logger.*(..., extra={...}))
-        for k, v in record.__dict__.items():
-            if k not in self.STANDARD_KEYS and k not in base:
-                base[k] = v
+        # 3) Merge extra fields from the record (added via logger.*(..., extra={...})).
+        # dict_keys - frozenset runs the membership tests in C; records
+        # without extras produce an empty set and skip the loop entirely.
+        rd = record.__dict__
+        extra_keys = rd.keys() - self._SKIP_KEYS
+        for k in extra_keys:
+            if k not in extras:
+                extras[k] = rd[k]
 
         # 4) Exceptions
         if record.exc_info:
-            base["exception"] = self.formatException(record.exc_info)
+            extras["exception"] = self.formatException(record.exc_info)
+
+        # Derive the ISO timestamp from record.created (captured at
+        # makeRecord time) instead of allocating a fresh aware datetime per
+        # record; also fixes the old "+00:00Z" double suffix.
+        ct = record.created
+        ms = int((ct - int(ct)) * 1000)
+        ts = f"{time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(ct))}.{ms:03d}Z"
+
+        if not self.HEADER_KEYS.isdisjoint(extras):
+            # Message wants to override header fields: serialize the whole
+            # dict the old way
+            base: Dict[str, Any] = {
+                "timestamp": ts,
+                "level": record.levelname,
+                "session_id": self.session_id,
+                "logger": record.name,
+            }
+            base.update(extras)
+            return self._dumps(base)
+
+        # Fast path: concatenate the pre-escaped header fragments and only
+        # serialize the variable extras
+        logger_frag = self._logger_fragments.get(record.name)
+        if logger_frag is None:
+            logger_frag = json.dumps(record.name, ensure_ascii=False)
+            self._logger_fragments[record.name] = logger_frag
+        prefix = (
+            '{"timestamp":"' + ts + '","level":"' + record.levelname
+            + '","session_id":' + self._session_fragment
+            + ',"logger":' + logger_frag
+        )
+        if not extras:
+            return prefix + "}"
+        rest = self._dumps(extras)
+        return prefix + "," + rest[1:]
+
+
+class BufferedJsonFileHandler(logging.FileHandler):
+    """
+    FileHandler variant that keeps a large (64 KiB) write buffer and skips the
+    per-record flush, so each logger call no longer costs a write syscall.
+
+    The buffer is flushed on ERROR and above, at most every `flush_interval`
+    seconds otherwise, and on close (logging.shutdown runs at interpreter
+    exit, so records are not lost).
+    """
+
+    def __init__(self, filename, encoding: str = "utf-8", flush_interval: float = 2.0):
+        super().__init__(filename, encoding=encoding, delay=True)
+        self._flush_interval = flush_interval
+        self._last_flush = 0.0
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=64 * 1024, encoding=self.encoding)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+            now = time.monotonic()
+            if record.levelno >= logging.ERROR or now - self._last_flush >= self._flush_interval:
+                self.flush()
+                self._last_flush = now
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class BytesStreamHandler(logging.StreamHandler):
+    """
+    Console handler that writes encoded bytes straight to sys.stderr.buffer,
+    skipping the text layer's per-line encode + flush. Flushes on ERROR and
+    above or every `flush_every` records; falls back to plain text writes
+    when stderr has no buffer (e.g. replaced by a capture object).
+    """
+
+    def __init__(self, flush_every: int = 32):
+        super().__init__(sys.stderr)
+        self._flush_every = flush_every
+        self._since_flush = 0
 
-        return json.dumps(base, ensure_ascii=False)
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            msg = self.format(record)
+            buf = getattr(sys.stderr, "buffer", None)
+            if buf is not None:
+                buf.write(msg.encode("utf-8") + b"\n")
+            else:
+                sys.stderr.write(msg + "\n")
+            self._since_flush += 1
+            if record.levelno >= logging.ERROR or self._since_flush >= self._flush_every:
+                self.flush()
+                self._since_flush = 0
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        try:
+            buf = getattr(sys.stderr, "buffer", None)
+            if buf is not None:
+                buf.flush()
+            else:
+                sys.stderr.flush()
+        except Exception:
+            pass
+
+
+@functools.lru_cache(maxsize=64)
+def _get_formatter(session_id: str) -> JsonFormatter:
+    """One JsonFormatter per session: Streamlit reruns re-enter the setup
+    functions with the same session_id, and the formatter's fragment caches
+    are only useful if the instance survives the rerun."""
+    return JsonFormatter(session_id)
+
+
+def _stop_listener(listener: "logging.handlers.QueueListener") -> None:
+    """Stop a QueueListener, tolerating double-stop during shutdown/reruns."""
+    try:
+        listener.stop()
+    except Exception:
+        pass
+
+
+class _PassthroughQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that enqueues records unmodified.
+
+    The stock prepare() pre-formats the record and replaces msg with the
+    rendered string, which would turn dict messages into their repr before
+    JsonFormatter can merge them. The queue is in-process, so records need
+    no pickling-related sanitization.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _attach_via_queue(logger: logging.Logger, handlers: list, level: int) -> None:
+    """
+    Attach `handlers` to `logger` behind a QueueHandler/QueueListener pair, so
+    the caller's thread only enqueues the record and formatting plus file and
+    console writes happen on the listener's background thread.
+    """
+    # Stop the listener from a previous setup call (Streamlit reruns)
+    old = getattr(logger, "_listener", None)
+    if old is not None:
+        _stop_listener(old)
+
+    q: "queue.Queue" = queue.Queue(-1)
+    qh = _PassthroughQueueHandler(q)
+    qh.setLevel(level)
+    logger.addHandler(qh)
+
+    listener = logging.handlers.QueueListener(q, *handlers, respect_handler_level=True)
+    listener.start()
+    logger._listener = listener
+    atexit.register(_stop_listener, listener)
+
+
+def _make_file_handler(path: Path, level: int, formatter: JsonFormatter) -> logging.Handler:
+    """Build the buffered file handler + memory batching stack.
+
+    Shared by setup_logging and mirror_json_handlers_to_root so both stay on
+    the same flushing behavior.
+    """
+    fh = BufferedJsonFileHandler(path, encoding="utf-8")
+    fh.setFormatter(formatter)
+    fh.setLevel(level)
+    # Batch records in memory and hand them to the file handler in chunks;
+    # ERROR and above flushes immediately
+    mh = logging.handlers.MemoryHandler(
+        capacity=512, flushLevel=logging.ERROR, target=fh, flushOnClose=True
+    )
+    mh.setLevel(level)
+    atexit.register(mh.close)
+    return mh
+
+
+@functools.lru_cache(maxsize=1)
+def _ensure_log_dir() -> Path:
+    """Resolve and create the logs/ directory once per process.
+
+    Both setup paths (and Streamlit reruns) used to re-join the path and
+    re-stat it via mkdir on every call.
+    """
+    log_dir = SETTINGS.ROOT_DIR / "logs"
+    log_dir.mkdir(parents=True, exist_ok=True)
+    return log_dir
 
 
 def setup_logging(
@@ -95,11 +331,12 @@ def setup_logging(
     """
     session_id = session_id or str(uuid.uuid4())
 
-    log_dir = SETTINGS.ROOT_DIR / "logs"
     if to_file:
-        log_dir.mkdir(parents=True, exist_ok=True)
-        # Daily log file naming - add seconds to the name to avoid collisions in fast session creation
-        current_day = datetime.now().strftime("%Y-%m-%d-%H%M%S")
+        log_dir = _ensure_log_dir()
+        # Daily log file naming - add seconds to the name to avoid collisions
+        # in fast session creation. time.strftime formats the current time
+        # without allocating a datetime object first.
+        current_day = time.strftime("%Y-%m-%d-%H%M%S")
         if one_log_per_session:
             log_file = log_dir / f"{app_name}_{current_day}_{session_id}.log"
         else:
@@ -113,19 +350,20 @@ def setup_logging(
     for h in logger.handlers[:]:
         logger.removeHandler(h)
 
-    formatter = JsonFormatter(session_id)
+    formatter = _get_formatter(session_id)
+    handlers = []
 
     if to_file:
-        fh = logging.FileHandler(log_file, encoding="utf-8")
-        fh.setFormatter(formatter)
-        fh.setLevel(level)
-        logger.addHandler(fh)
+        handlers.append(_make_file_handler(log_file, level, formatter))
 
     if to_console:
-        sh = logging.StreamHandler()
+        sh = BytesStreamHandler()
         sh.setFormatter(formatter)
         sh.setLevel(level)
-        logger.addHandler(sh)
+        handlers.append(sh)
+
+    # Callers just enqueue; the listener thread formats and writes
+    _attach_via_queue(logger, handlers, level)
 
     # Emit an initialization event
     logger.info({"event": "logger_initialized", "session_id": session_id, "app_name": app_name})
@@ -141,21 +379,27 @@ def parse_escaped_string(s: str) -> str:
         raw = "Line1\\nLine2\\nLine3"
         logger.info(parse_escaped_string(raw))
     """
-    import json as _json
-    import ast as _ast
-
     text = s.strip()
     if not text:
         return text
 
+    # Most inputs carry no escapes and no quoting; one substring scan is far
+    # cheaper than the encode/decode round-trip below
+    if "\\" not in text and text[0] not in "\"'":
+        return text
+
     if (text.startswith('"') and text.endswith('"')) or (text.startswith("'") and text.endswith("'")):
         try:
-            return _json.loads(text)
-        except _json.JSONDecodeError:
+            parsed = orjson.loads(text) if orjson is not None else json.loads(text)
+        except (ValueError, TypeError):
+            # Single-quoted or otherwise non-JSON: decode the escapes
+            # directly instead of the old ast.literal_eval fallback, which
+            # built a full AST for a string literal
             try:
-                return _ast.literal_eval(text)
+                return codecs.decode(text.strip("'\""), "unicode_escape")
             except Exception:
                 return text
+        return parsed
     else:
         return text.encode("utf-8").decode("unicode_escape")
 
@@ -168,21 +412,30 @@ def log_sql(logger: logging.Logger, sql: str, **meta: Any) -> None:
     Example:
         log_sql(logger, sql_text, phase="execute", source="mcp", rows=252, duration_ms=87)
     """
-    payload = {"event": "sql_run", "sql": sql}
-    payload.update(meta)
-    logger.info(payload)
+    # Skip the payload build entirely when INFO is filtered out
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    # One BUILD_MAP with the splat folded in, instead of literal + update()
+    logger.info({"event": "sql_run", "sql": sql, **meta})
 
 
 def log_dataset(logger: logging.Logger, rows: int, cols: int, sample: Optional[Any] = None, **meta: Any) -> None:
     """
     Log dataset shape and (optional) small sample as real JSON objects.
+
+    `sample` may be a zero-argument callable; it is only invoked when INFO is
+    enabled, so callers can defer e.g. df.head(3).to_dict(...) behind a
+    lambda instead of always materializing it.
+
     Example:
-        log_dataset(logger, rows=len(df), cols=len(df.columns), sample=df.head(3).to_dict(orient="records"))
+        log_dataset(logger, rows=len(df), cols=len(df.columns),
+                    sample=lambda: df.head(3).to_dict(orient="records"))
     """
-    payload = {"event": "dataset_ready", "rows": rows, "cols": cols}
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    payload = {"event": "dataset_ready", "rows": rows, "cols": cols, **meta}
     if sample is not None:
-        payload["sample"] = sample
-    payload.update(meta)
+        payload["sample"] = sample() if callable(sample) else sample
     logger.info(payload)
 
 
@@ -216,15 +469,24 @@ def get_current_test_id() -> Optional[str]:
         return None
 
 
+# Original factory captured on first install; re-installs wrap this instead
+# of the current factory, so the chain stays depth-1 across Streamlit reruns
+_original_record_factory = None
+
+
 def install_test_id_factory() -> None:
     """
     Install a LogRecordFactory that injects the current test_id (if any)
     into every LogRecord as the attribute `test_id`.
 
-    Call this once early in your app (e.g., at Streamlit button click) and
-    then call `set_test_id(test_id)` for each run/session.
+    Safe to call on every rerun: the pristine factory is remembered on the
+    first install, and later calls wrap that one rather than stacking
+    another closure on top of the previous install.
     """
-    original_factory = logging.getLogRecordFactory()
+    global _original_record_factory
+    if _original_record_factory is None:
+        _original_record_factory = logging.getLogRecordFactory()
+    original_factory = _original_record_factory
 
     def factory(*args, **kwargs):
         record = original_factory(*args, **kwargs)
@@ -261,23 +523,23 @@ def mirror_json_handlers_to_root(
     for h in root.handlers[:]:
         root.removeHandler(h)
 
-    fmt = JsonFormatter(session_id=session_id)
+    fmt = _get_formatter(session_id)
+    handlers = []
 
     if to_file:
-        log_dir = SETTINGS.ROOT_DIR / "logs"
-        log_dir.mkdir(parents=True, exist_ok=True)
-        current_day = datetime.now().strftime("%Y-%m-%d")
+        log_dir = _ensure_log_dir()
+        current_day = time.strftime("%Y-%m-%d")
         log_file = log_dir / f"{app_name}_{current_day}_root.log"
-        fh = logging.FileHandler(log_file, encoding="utf-8")
-        fh.setFormatter(fmt)
-        fh.setLevel(level)
-        root.addHandler(fh)
+        handlers.append(_make_file_handler(log_file, level, fmt))
 
     if to_console:
-        sh = logging.StreamHandler()
+        sh = BytesStreamHandler()
         sh.setFormatter(fmt)
         sh.setLevel(level)
-        root.addHandler(sh)
+        handlers.append(sh)
+
+    # Same off-thread I/O as setup_logging
+    _attach_via_queue(root, handlers, level)
 
 """
 USAGE EXAMPLE:
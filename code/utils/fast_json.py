@@ -0,0 +1,34 @@
+"""
+Thin JSON helper backed by orjson with a stdlib fallback.
+
+Use on hot paths that parse/serialize multi-KB payloads (LLM chart
+responses, datasets, log records): orjson is a C/SIMD implementation,
+typically 3-6x faster than stdlib json. Environments without orjson
+fall back to the stdlib transparently.
+"""
+import json as _json
+
+try:
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - optional speedup
+    _orjson = None
+
+
+if _orjson is not None:
+    loads = _orjson.loads
+
+    def dumps(obj) -> str:
+        # default=str mirrors what the stdlib fallback does for Paths,
+        # datetimes, Decimals, etc.
+        return _orjson.dumps(obj, default=str).decode()
+
+    def dumps_bytes(obj) -> bytes:
+        return _orjson.dumps(obj, default=str)
+else:
+    loads = _json.loads
+
+    def dumps(obj) -> str:
+        return _json.dumps(obj, default=str)
+
+    def dumps_bytes(obj) -> bytes:
+        return _json.dumps(obj, default=str).encode()
@@ -6,8 +6,8 @@ Provides a lightweight interface used by services/nodes:
 - query(sql, params: list | None, limit: int | None, timeout_ms: int | None) -> dict
 
 Notes
-- This client establishes a fresh stdio session per call for simplicity and robustness.
-  You can optimize later by keeping a persistent session if needed.
+- The stdio session (server process + MCP handshake) is created lazily on
+  first use and reused across calls; call `aclose()` to tear it down.
 - Requires `mcp` and `asyncio`.
 
 Example
@@ -20,9 +20,16 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import socket
+import threading
 from typing import Any, Dict, List, Optional, Tuple
 import json
 
+try:
+    import orjson  # C-implemented JSON; dumps returns bytes directly
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
 try:
     from mcp.client.stdio import stdio_client, StdioServerParameters  # type: ignore
     from mcp.client.session import ClientSession  # type: ignore
@@ -35,6 +42,31 @@ from config.settings import SETTINGS
 
 log = logging.getLogger("agentic_data_assistant.mcp_client")
 
+# One background event loop for the sync facades: asyncio.run per call built
+# and tore down a loop each time, and would also invalidate the persistent
+# stdio session between calls. All sync entry points submit onto this loop.
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_LOOP_LOCK = threading.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    global _LOOP
+    with _LOOP_LOCK:
+        if _LOOP is None:
+            _LOOP = asyncio.new_event_loop()
+            threading.Thread(
+                target=_LOOP.run_forever, name="mcp-client-loop", daemon=True
+            ).start()
+    return _LOOP
+
+
+def _run_sync(coro):
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
+
+
+# Shared sentinel for "no params": avoids allocating a fresh list per query
+_EMPTY_PARAMS: List[Any] = []
+
 
 class MCPSQLClient:
     def __init__(
@@ -59,58 +91,143 @@ class MCPSQLClient:
         self._tcp_port = tcp_port or 8765
         self._max_rows = max_rows
         self._timeout_ms = timeout_ms
+        # Persistent stdio session state: spawning the server process per
+        # call costs interpreter startup every query; the session is created
+        # lazily and reused for the lifetime of this client.
+        self._session: Optional[ClientSession] = None
+        self._session_cm = None
+        self._stdio_cm = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._session_lock = asyncio.Lock()
+        # Keep-alive pool for TCP mode; connections are returned after each
+        # request instead of paying handshake + teardown per query
+        self._tcp_pool: Optional[asyncio.Queue] = None
+
+    async def _tcp_acquire(self):
+        if self._tcp_pool is None:
+            self._tcp_pool = asyncio.Queue(maxsize=4)
+        while True:
+            try:
+                reader, writer = self._tcp_pool.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            if not writer.is_closing():
+                return reader, writer
+        reader, writer = await asyncio.open_connection(self._tcp_host, self._tcp_port)
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            # Requests are small; Nagle batching only adds latency here
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return reader, writer
+
+    def _tcp_release(self, reader, writer) -> None:
+        try:
+            self._tcp_pool.put_nowait((reader, writer))
+        except asyncio.QueueFull:
+            writer.close()
+
+    def _server_params(self) -> StdioServerParameters:
+        if isinstance(self._server_cmd, list) and len(self._server_cmd) >= 1:
+            return StdioServerParameters(
+                command=self._server_cmd[0], args=self._server_cmd[1:]
+            )
+        elif isinstance(self._server_cmd, str):
+            return StdioServerParameters(command=self._server_cmd)
+        raise RuntimeError(
+            "Invalid MCP stdio server command. Expected list[str] or str."
+        )
+
+    async def _ensure_session(self) -> ClientSession:
+        """Lazily create (and then reuse) the stdio server process + session.
+
+        If the session was created on a different, now-closed event loop
+        (e.g. callers still using asyncio.run per call), it is discarded and
+        rebuilt on the current loop.
+        """
+        running = asyncio.get_running_loop()
+        if self._session is not None and self._session_loop is running:
+            return self._session
+        async with self._session_lock:
+            if self._session is not None and self._session_loop is running:
+                return self._session
+            self._session = None
+            self._session_cm = None
+            self._stdio_cm = None
+
+            self._stdio_cm = stdio_client(self._server_params())
+            read_stream, write_stream = await self._stdio_cm.__aenter__()
+            # Support both MCP client API shapes (see _acall_tool history)
+            try:
+                cm = ClientSession(
+                    read_stream=read_stream,
+                    write_stream=write_stream,
+                    client_name="mcp-sql-client",
+                )
+                session = await cm.__aenter__()
+            except TypeError:
+                cm = ClientSession("mcp-sql-client")
+                session = await cm.__aenter__()
+                await session.connect(read_stream, write_stream)
+            self._session_cm = cm
+            self._session = session
+            self._session_loop = running
+            return session
+
+    async def aclose(self) -> None:
+        """Tear down the persistent stdio session (if any)."""
+        if self._session_cm is not None:
+            try:
+                await self._session_cm.__aexit__(None, None, None)
+            except Exception:
+                pass
+            self._session_cm = None
+            self._session = None
+        if self._stdio_cm is not None:
+            try:
+                await self._stdio_cm.__aexit__(None, None, None)
+            except Exception:
+                pass
+            self._stdio_cm = None
+        self._session_loop = None
+        if self._tcp_pool is not None:
+            while True:
+                try:
+                    _reader, writer = self._tcp_pool.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                writer.close()
+            self._tcp_pool = None
 
     async def _acall_tool(self, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """Call a tool either via stdio MCP or TCP JSON server."""
         log.debug("MCP call %s args=%s", name, {**arguments, **{"_redacted": True}})
         if self._mode == "tcp":
-            reader, writer = await asyncio.open_connection(self._tcp_host, self._tcp_port)
+            reader, writer = await self._tcp_acquire()
             req = {"tool": name, "arguments": arguments}
-            writer.write((json.dumps(req) + "\n").encode("utf-8"))
+            if orjson is not None:
+                # dumps returns bytes; writelines avoids the str concat +
+                # encode round-trip
+                writer.writelines([orjson.dumps(req), b"\n"])
+            else:
+                writer.write((json.dumps(req) + "\n").encode("utf-8"))
             await writer.drain()
             line = await reader.readline()
-            writer.close()
-            try:
-                await writer.wait_closed()
-            except Exception:
-                pass
             if not line:
+                # Connection died; don't return it to the pool
+                writer.close()
                 return {"error": "no response"}
-            resp = json.loads(line.decode("utf-8"))
+            self._tcp_release(reader, writer)
+            # orjson.loads accepts bytes, skipping the decode pass
+            resp = orjson.loads(line) if orjson is not None else json.loads(line.decode("utf-8"))
             if not resp.get("ok", False):
                 # unify error surface
                 return {"error": resp.get("error", "unknown error")}
             return resp.get("result", {})
         else:
-            # stdio MCP: build proper StdioServerParameters from command list/string
-            server_params: StdioServerParameters
-            if isinstance(self._server_cmd, list) and len(self._server_cmd) >= 1:
-                server_params = StdioServerParameters(
-                    command=self._server_cmd[0], args=self._server_cmd[1:]
-                )
-            elif isinstance(self._server_cmd, str):
-                server_params = StdioServerParameters(command=self._server_cmd)
-            else:
-                raise RuntimeError(
-                    "Invalid MCP stdio server command. Expected list[str] or str."
-                )
-            async with stdio_client(server_params) as (read_stream, write_stream):  # type: ignore
-                # Support both MCP client API shapes:
-                # Newer: ClientSession(read_stream=..., write_stream=..., client_name="...")
-                # Older: ClientSession(client_name).connect(read_stream, write_stream)
-                try:
-                    async with ClientSession(
-                        read_stream=read_stream,
-                        write_stream=write_stream,
-                        client_name="mcp-sql-client",
-                    ) as session:  # type: ignore
-                        result = await session.call_tool(name, arguments=arguments)  # type: ignore
-                        return result  # type: ignore
-                except TypeError:
-                    async with ClientSession("mcp-sql-client") as session:  # type: ignore
-                        await session.connect(read_stream, write_stream)  # type: ignore
-                        result = await session.call_tool(name, arguments=arguments)  # type: ignore
-                        return result  # type: ignore
+            # stdio MCP over the persistent session (spawned on first use)
+            session = await self._ensure_session()
+            result = await session.call_tool(name, arguments=arguments)  # type: ignore
+            return result  # type: ignore
 
     async def avalidate(self, query: str) -> Tuple[bool, Optional[str]]:
         resp = await self._acall_tool("sql.validate", {"query": query})
@@ -126,19 +243,22 @@ class MCPSQLClient:
     ) -> Dict[str, Any]:
         payload = {
             "query": query,
-            "params": params or [],
+            "params": params if params is not None else _EMPTY_PARAMS,
             "limit": limit,
             "timeout_ms": timeout_ms or self._timeout_ms,
         }
         resp = await self._acall_tool("sql.query", payload)
         # Ensure shape
         rows = resp.get("rows", [])
-        rowcount = resp.get("rowcount", len(rows))
-        return {"rows": rows, "rowcount": rowcount, **({"error": resp["error"]} if "error" in resp else {})}
+        out = {"rows": rows, "rowcount": resp.get("rowcount", len(rows))}
+        if "error" in resp:
+            out["error"] = resp["error"]
+        return out
 
-    # Synchronous facades for convenience in sync code paths
+    # Synchronous facades for convenience in sync code paths. They submit to
+    # the shared background loop, so the stdio session survives across calls.
     def validate(self, query: str) -> Tuple[bool, Optional[str]]:
-        return asyncio.run(self.avalidate(query))
+        return _run_sync(self.avalidate(query))
 
     def query(
         self,
@@ -147,7 +267,11 @@ class MCPSQLClient:
         limit: Optional[int] = None,
         timeout_ms: Optional[int] = None,
     ) -> Dict[str, Any]:
-        return asyncio.run(self.aquery(query, params=params, limit=limit, timeout_ms=timeout_ms))
+        return _run_sync(self.aquery(query, params=params, limit=limit, timeout_ms=timeout_ms))
+
+    def close(self) -> None:
+        """Synchronous teardown of the persistent session."""
+        _run_sync(self.aclose())
 
 
 def get_mcp_sql_client_from_settings() -> Optional[MCPSQLClient]:
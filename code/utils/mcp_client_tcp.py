@@ -7,8 +7,8 @@ Provides a lightweight interface used by services/nodes:
 
 Notes
 - This client only supports TCP mode for connecting to MCP servers.
-- Establishes fresh TCP connections per call for simplicity and robustness.
-- TODO: Later we will add an optimized version of the tcp client that uses asyncio-tcp connection pooling for production readiness.
+- Connections are pooled and kept alive between calls (see MCPConnectionPool);
+  dead sockets are dropped and replaced transparently.
 - Requires `asyncio`.
 
 Example
@@ -20,14 +20,124 @@ Example
 from __future__ import annotations
 
 import asyncio
+import atexit
 import logging
+import socket
+import struct
+import threading
 from typing import Any, Dict, List, Optional, Tuple
 import json
 
+try:
+    import msgpack  # binary wire format; parses row payloads faster than JSON
+except ImportError:  # pragma: no cover - optional speedup
+    msgpack = None
+
+try:
+    import orjson  # C JSON; dumps returns bytes and loads accepts bytes
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
 from config.settings import SETTINGS
 
 log = logging.getLogger("agentic_data_assistant.mcp_client_tcp")
 
+# One background event loop shared by the sync facades: asyncio.run built and
+# tore down a fresh loop (selector, resolver state and all) on every
+# validate/query call, which dominates the cost of small SQL round-trips.
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_LOOP_LOCK = threading.Lock()
+
+
+def _get_shared_loop() -> asyncio.AbstractEventLoop:
+    global _LOOP
+    with _LOOP_LOCK:
+        if _LOOP is None:
+            _LOOP = asyncio.new_event_loop()
+            threading.Thread(
+                target=_LOOP.run_forever, name="mcp-tcp-client-loop", daemon=True
+            ).start()
+            atexit.register(_LOOP.call_soon_threadsafe, _LOOP.stop)
+    return _LOOP
+
+
+def _run_sync(coro):
+    return asyncio.run_coroutine_threadsafe(coro, _get_shared_loop()).result()
+
+
+class MCPConnectionPool:
+    """Keep-alive pool of (reader, writer) pairs for one (host, port).
+
+    Reusing sockets turns each tool call from TCP handshake + round-trip
+    into just the round-trip. `max_connections` bounds how many sockets may
+    be open at once; `max_keepalive` bounds how many idle ones are retained.
+    Dead or errored connections are dropped instead of returned.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        connect_timeout: float,
+        max_connections: int,
+        max_keepalive: int,
+    ) -> None:
+        self._host = host
+        self._port = port
+        self._connect_timeout = connect_timeout
+        self._idle: asyncio.Queue = asyncio.Queue(maxsize=max_keepalive)
+        self._sem = asyncio.Semaphore(max_connections)
+
+    async def acquire(
+        self, *, fresh: bool = False
+    ) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter, bool]:
+        """Return (reader, writer, reused).
+
+        `reused` is True when the pair came from the idle queue. Peer-side
+        closes are invisible to `is_closing()` (it only reflects local
+        close), so a reused socket may still be dead; callers detect that on
+        the first exchange and retry with `fresh=True`, which bypasses the
+        idle queue and opens a new connection.
+        """
+        await self._sem.acquire()
+        try:
+            if not fresh:
+                while True:
+                    try:
+                        reader, writer = self._idle.get_nowait()
+                    except asyncio.QueueEmpty:
+                        break
+                    if not writer.is_closing():
+                        return reader, writer, True
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(self._host, self._port),
+                timeout=self._connect_timeout,
+            )
+        except BaseException:
+            self._sem.release()
+            raise
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            # Requests are small; Nagle batching only adds latency here
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return reader, writer, False
+
+    def release(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        *,
+        discard: bool = False,
+    ) -> None:
+        if discard or writer.is_closing():
+            writer.close()
+        else:
+            try:
+                self._idle.put_nowait((reader, writer))
+            except asyncio.QueueFull:
+                writer.close()
+        self._sem.release()
+
 
 class MCPSQLClientTCP:
     def __init__(
@@ -38,6 +148,9 @@ class MCPSQLClientTCP:
         max_rows: int = 5000,
         timeout_ms: int = 20000,
         connection_timeout: float = 10.0,
+        pool_max: int = 4,
+        pool_keepalive: int = 4,
+        wire_format: str = "msgpack",
     ) -> None:
         """Create a TCP-only MCP SQL client.
 
@@ -47,58 +160,172 @@ class MCPSQLClientTCP:
             max_rows: Maximum rows to return from queries
             timeout_ms: Query timeout in milliseconds
             connection_timeout: TCP connection timeout in seconds
+            pool_max: Max concurrent TCP connections
+            pool_keepalive: Max idle connections kept alive between calls
+            wire_format: "msgpack" (length-prefixed binary) or "json"
+                (newline-delimited); falls back to JSON when msgpack is
+                not installed
         """
         self._tcp_host = tcp_host
         self._tcp_port = tcp_port
         self._max_rows = max_rows
         self._timeout_ms = timeout_ms
         self._connection_timeout = connection_timeout
+        self._wire_format = wire_format if msgpack is not None else "json"
+        self._pool = MCPConnectionPool(
+            tcp_host, tcp_port, connection_timeout, pool_max, pool_keepalive
+        )
 
     async def _acall_tool(self, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """Call a tool via TCP JSON server."""
         log.debug("TCP MCP call %s to %s:%d", name, self._tcp_host, self._tcp_port)
-        
-        try:
-            # Establish TCP connection with timeout
-            reader, writer = await asyncio.wait_for(
-                asyncio.open_connection(self._tcp_host, self._tcp_port),
-                timeout=self._connection_timeout
-            )
-            
-            # Send request
-            req = {"tool": name, "arguments": arguments}
-            request_data = (json.dumps(req) + "\n").encode("utf-8")
-            writer.write(request_data)
-            await writer.drain()
-            
-            # Read response
-            line = await reader.readline()
-            
-            # Close connection
-            writer.close()
+
+        use_msgpack = self._wire_format == "msgpack"
+        req = {"tool": name, "arguments": arguments}
+        payload = b""
+        # A kept-alive socket may have been closed by the peer (server
+        # restart, idle timeout) without is_closing() knowing; when the first
+        # exchange on a reused socket fails, retry once on a fresh one.
+        for attempt in range(2):
+            try:
+                reader, writer, reused = await self._pool.acquire(fresh=attempt > 0)
+            except asyncio.TimeoutError:
+                return {"error": f"connection timeout to {self._tcp_host}:{self._tcp_port}"}
+            except ConnectionRefusedError:
+                return {"error": f"connection refused to {self._tcp_host}:{self._tcp_port}"}
+            except Exception as e:
+                return {"error": f"unexpected error: {e}"}
+
             try:
-                await writer.wait_closed()
-            except Exception:
-                pass
-            
-            if not line:
+                if use_msgpack:
+                    # Length-prefixed binary framing: the reader can readexactly()
+                    # the body instead of scanning for a newline, and values with
+                    # embedded newlines need no escaping
+                    body = msgpack.packb(req, use_bin_type=True)
+                    writer.write(struct.pack(">I", len(body)) + body)
+                    await writer.drain()
+                    header = await reader.readexactly(4)
+                    (length,) = struct.unpack(">I", header)
+                    payload = await reader.readexactly(length)
+                else:
+                    # Legacy newline-delimited JSON framing
+                    if orjson is not None:
+                        writer.write(orjson.dumps(req) + b"\n")
+                    else:
+                        writer.write((json.dumps(req) + "\n").encode("utf-8"))
+                    await writer.drain()
+                    payload = await reader.readline()
+            except (ConnectionResetError, BrokenPipeError, asyncio.IncompleteReadError):
+                self._pool.release(reader, writer, discard=True)
+                if reused:
+                    continue
+                return {"error": f"connection lost to {self._tcp_host}:{self._tcp_port}"}
+            except Exception as e:
+                self._pool.release(reader, writer, discard=True)
+                return {"error": f"unexpected error: {e}"}
+
+            if not payload:
+                # Server closed the connection; don't return it to the pool
+                self._pool.release(reader, writer, discard=True)
+                if reused:
+                    continue
                 return {"error": "no response from TCP server"}
-            
-            # Parse response
-            resp = json.loads(line.decode("utf-8"))
-            if not resp.get("ok", False):
-                return {"error": resp.get("error", "unknown error")}
-            
-            return resp.get("result", {})
-            
-        except asyncio.TimeoutError:
-            return {"error": f"connection timeout to {self._tcp_host}:{self._tcp_port}"}
-        except ConnectionRefusedError:
-            return {"error": f"connection refused to {self._tcp_host}:{self._tcp_port}"}
-        except json.JSONDecodeError as e:
-            return {"error": f"invalid JSON response: {e}"}
+            self._pool.release(reader, writer)
+            break
+
+        # Parse response
+        try:
+            if use_msgpack:
+                resp = msgpack.unpackb(payload, raw=False)
+            elif orjson is not None:
+                resp = orjson.loads(payload)
+            else:
+                resp = json.loads(payload.decode("utf-8"))
         except Exception as e:
-            return {"error": f"unexpected error: {e}"}
+            return {"error": f"invalid response: {e}"}
+        if not resp.get("ok", False):
+            return {"error": resp.get("error", "unknown error")}
+
+        return resp.get("result", {})
+
+    async def avalidate_many(self, queries: List[str]) -> List[Tuple[bool, Optional[str]]]:
+        """Validate many SQL statements over one pooled connection.
+
+        All requests are written as a single batch and the responses are read
+        back in order (the server answers sequentially per connection), so
+        the write syscalls and round-trip waits are amortized across the
+        batch instead of paid per statement. On a connection-level failure
+        every remaining entry reports the same error.
+        """
+        if not queries:
+            return []
+
+        use_msgpack = self._wire_format == "msgpack"
+        reqs = [{"tool": "sql.validate", "arguments": {"query": q}} for q in queries]
+        resps: List[Dict[str, Any]] = []
+        # Same stale keep-alive handling as _acall_tool: a batch that fails
+        # on a reused socket is retried once on a freshly opened connection
+        for attempt in range(2):
+            try:
+                reader, writer, reused = await self._pool.acquire(fresh=attempt > 0)
+            except asyncio.TimeoutError:
+                err = f"connection timeout to {self._tcp_host}:{self._tcp_port}"
+                return [(False, err)] * len(queries)
+            except ConnectionRefusedError:
+                err = f"connection refused to {self._tcp_host}:{self._tcp_port}"
+                return [(False, err)] * len(queries)
+            except Exception as e:
+                return [(False, f"unexpected error: {e}")] * len(queries)
+
+            resps = []
+            try:
+                if use_msgpack:
+                    parts = []
+                    for r in reqs:
+                        body = msgpack.packb(r, use_bin_type=True)
+                        parts.append(struct.pack(">I", len(body)))
+                        parts.append(body)
+                    writer.writelines(parts)
+                    await writer.drain()
+                    for _ in queries:
+                        header = await reader.readexactly(4)
+                        (length,) = struct.unpack(">I", header)
+                        body = await reader.readexactly(length)
+                        resps.append(msgpack.unpackb(body, raw=False))
+                else:
+                    if orjson is not None:
+                        data = b"".join(orjson.dumps(r) + b"\n" for r in reqs)
+                    else:
+                        data = "".join(json.dumps(r) + "\n" for r in reqs).encode("utf-8")
+                    writer.write(data)
+                    await writer.drain()
+                    for _ in queries:
+                        line = await reader.readline()
+                        if not line:
+                            raise ConnectionResetError("server closed connection mid-batch")
+                        resps.append(
+                            orjson.loads(line) if orjson is not None else json.loads(line.decode("utf-8"))
+                        )
+            except (ConnectionResetError, BrokenPipeError, asyncio.IncompleteReadError):
+                self._pool.release(reader, writer, discard=True)
+                if reused:
+                    continue
+                err = f"connection lost to {self._tcp_host}:{self._tcp_port}"
+                return [(False, err)] * len(queries)
+            except Exception as e:
+                self._pool.release(reader, writer, discard=True)
+                return [(False, f"unexpected error: {e}")] * len(queries)
+            self._pool.release(reader, writer)
+            break
+
+        out: List[Tuple[bool, Optional[str]]] = []
+        for resp in resps:
+            if not resp.get("ok", False):
+                out.append((False, resp.get("error", "unknown error")))
+            else:
+                result = resp.get("result", {})
+                out.append((bool(result.get("valid", False)), result.get("message")))
+        return out
 
     async def avalidate(self, query: str) -> Tuple[bool, Optional[str]]:
         """Validate SQL query asynchronously."""
@@ -142,10 +369,15 @@ class MCPSQLClientTCP:
         log.debug("SQL query result: %d rows returned", rowcount)
         return {"rows": rows, "rowcount": rowcount}
 
-    # Synchronous facades for convenience in sync code paths
+    # Synchronous facades for convenience in sync code paths. They submit to
+    # the shared background loop instead of asyncio.run per call.
     def validate(self, query: str) -> Tuple[bool, Optional[str]]:
         """Validate SQL query synchronously."""
-        return asyncio.run(self.avalidate(query))
+        return _run_sync(self.avalidate(query))
+
+    def validate_many(self, queries: List[str]) -> List[Tuple[bool, Optional[str]]]:
+        """Validate many SQL statements synchronously over one connection."""
+        return _run_sync(self.avalidate_many(list(queries)))
 
     def query(
         self,
@@ -155,7 +387,7 @@ class MCPSQLClientTCP:
         timeout_ms: Optional[int] = None,
     ) -> Dict[str, Any]:
         """Execute SQL query synchronously."""
-        return asyncio.run(self.aquery(query, params=params, limit=limit, timeout_ms=timeout_ms))
+        return _run_sync(self.aquery(query, params=params, limit=limit, timeout_ms=timeout_ms))
 
     def test_connection(self) -> Tuple[bool, Optional[str]]:
         """Test TCP connection to MCP server."""
@@ -179,6 +411,9 @@ def get_tcp_mcp_sql_client_from_settings() -> Optional[MCPSQLClientTCP]:
       - MCP_SQL_MAX_ROWS: int (default: 5000)
       - MCP_SQL_TIMEOUT_MS: int (default: 20000)
       - MCP_CONNECTION_TIMEOUT: float (default: 10.0)
+      - MCP_POOL_MAX: int (default: 4)
+      - MCP_POOL_KEEPALIVE: int (default: 4)
+      - MCP_WIRE_FORMAT: str (default: "msgpack")
     """
     enabled = bool(getattr(SETTINGS, "MCP_ENABLED", False))
     if not enabled:
@@ -190,15 +425,21 @@ def get_tcp_mcp_sql_client_from_settings() -> Optional[MCPSQLClientTCP]:
     max_rows = int(getattr(SETTINGS, "MCP_SQL_MAX_ROWS", 5000))
     timeout_ms = int(getattr(SETTINGS, "MCP_SQL_TIMEOUT_MS", 20000))
     connection_timeout = float(getattr(SETTINGS, "MCP_CONNECTION_TIMEOUT", 10.0))
-    
+    pool_max = int(getattr(SETTINGS, "MCP_POOL_MAX", 4))
+    pool_keepalive = int(getattr(SETTINGS, "MCP_POOL_KEEPALIVE", 4))
+    wire_format = getattr(SETTINGS, "MCP_WIRE_FORMAT", "msgpack")
+
     log.info("Creating TCP MCP client: %s:%d", tcp_host, tcp_port)
-    
+
     return MCPSQLClientTCP(
         tcp_host=tcp_host,
         tcp_port=tcp_port,
         max_rows=max_rows,
         timeout_ms=timeout_ms,
         connection_timeout=connection_timeout,
+        pool_max=pool_max,
+        pool_keepalive=pool_keepalive,
+        wire_format=wire_format,
     )
 
 
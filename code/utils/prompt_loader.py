@@ -1,13 +1,30 @@
+import functools
+import io
+import os
 import yaml
 from typing import Any, Dict, List
 
+from utils.yaml_cache import load_yaml_cached
+
+try:
+    from yaml import CSafeDumper as _SafeDumper  # libyaml: ~15x faster dumps
+except ImportError:  # pragma: no cover - pyyaml built without libyaml
+    from yaml import SafeDumper as _SafeDumper
+
 def _yaml_block(data: Any) -> str:
     """Render a Python object as YAML with stable, readable formatting."""
-    return yaml.safe_dump(data, sort_keys=False, allow_unicode=True).rstrip()
+    return yaml.dump(data, Dumper=_SafeDumper, sort_keys=False, allow_unicode=True).rstrip()
 
 def build_system_prompt_from_yaml(yaml_path: str, agent_name: str) -> str:
-    with open(yaml_path, "r", encoding="utf-8") as f:
-        cfg = yaml.safe_load(f) or {}
+    # The assembled prompt is deterministic given the file contents, so it is
+    # memoized per (path, agent, mtime); edits to config.yaml invalidate it.
+    return _build_system_prompt_cached(
+        str(yaml_path), agent_name, os.stat(yaml_path).st_mtime_ns
+    )
+
+@functools.lru_cache(maxsize=64)
+def _build_system_prompt_cached(yaml_path: str, agent_name: str, _mtime_ns: int) -> str:
+    cfg = load_yaml_cached(yaml_path) or {}
 
     # Look under data_assistant > agents
     agent_cfg: Dict[str, Any] = (
@@ -20,58 +37,63 @@ def build_system_prompt_from_yaml(yaml_path: str, agent_name: str) -> str:
 
     prompt_cfg: Dict[str, Any] = agent_cfg.get("prompt_config", {}) or {}
 
-    lines: List[str] = [f"Agent: {agent_name}"]
+    # Stream into one buffer; each segment is written with its newline so no
+    # intermediate list is built and joined at the end
+    buf = io.StringIO()
+    w = buf.write
+    w(f"Agent: {agent_name}\n")
 
     # Core prompt parts
     role = prompt_cfg.get("role")
     if role:
-        lines.append(f"Role: {role}")
+        w(f"Role: {role}\n")
 
     context = prompt_cfg.get("context")
     if context:
-        lines.append(f"Context: {context}")
+        w(f"Context: {context}\n")
 
     instruction = prompt_cfg.get("instruction")
     if instruction:
-        lines.append("Instruction:")
-        lines.append(instruction)
+        w("Instruction:\n")
+        w(f"{instruction}\n")
 
     # New: chart_hint_instruction (verbatim block the model must follow)
     chart_hint_instr = prompt_cfg.get("chart_hint_instruction")
     if chart_hint_instr:
-        lines.append("**chart_hint_instruction**:")
-        lines.append(chart_hint_instr)
+        w("**chart_hint_instruction**:\n")
+        w(f"{chart_hint_instr}\n")
 
     # New: few_shots (render cleanly so the LLM can pattern-match)
     few_shots = prompt_cfg.get("few_shots")
     if isinstance(few_shots, list) and few_shots:
-        lines.append("Few-Shot Examples:")
+        w("Few-Shot Examples:\n")
         for i, ex in enumerate(few_shots, start=1):
             # Pull common fields if present; dump the rest to YAML
             user_query = ex.get("user_query")
             rest = {k: v for k, v in ex.items() if k != "user_query"}
 
-            lines.append(f"Example {i}:")
+            w(f"Example {i}:\n")
             if user_query:
-                lines.append("User Query:")
-                lines.append(user_query)
+                w("User Query:\n")
+                w(f"{user_query}\n")
 
             if rest:
-                lines.append("Example Context & Expected Output (YAML):")
-                lines.append(_yaml_block(rest))
+                w("Example Context & Expected Output (YAML):\n")
+                w(f"{_yaml_block(rest)}\n")
 
     # Style / tone, goal, etc.
     style = prompt_cfg.get("style_or_tone")
     if isinstance(style, list) and style:
-        lines.append("Style or Tone:")
+        w("Style or Tone:\n")
         for s in style:
-            lines.append(f"- {s}")
+            w(f"- {s}\n")
 
     goal = prompt_cfg.get("goal")
     if goal:
-        lines.append(f"Goal: {goal}")
+        w(f"Goal: {goal}\n")
 
-    return "\n".join(lines)
+    # Drop the trailing newline the last write added ("\n".join parity)
+    return buf.getvalue()[:-1]
 
 def get_llm_config_from_yaml(yaml_path: str, agent_name: str) -> Dict[str, Any]:
     """
@@ -81,8 +103,8 @@ def get_llm_config_from_yaml(yaml_path: str, agent_name: str) -> Dict[str, Any]:
         temperature: 0.5
         max_retries: 1
     """
-    with open(yaml_path, "r", encoding="utf-8") as f:
-        cfg = yaml.safe_load(f) or {}
+    # Parsed-document cache keyed by (path, mtime, size); see utils.yaml_cache
+    cfg = load_yaml_cached(yaml_path) or {}
 
     # Look under data_assistant > agents
     agent_cfg: Dict[str, Any] = (
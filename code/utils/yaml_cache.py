@@ -0,0 +1,55 @@
+"""Cached YAML loading keyed by file identity (path, mtime, size).
+
+Config YAML (metrics registry, sql_templates, semantic models) is re-read by
+several services that may be constructed once per request. Parsing the same
+unchanged file repeatedly is pure waste, so this module keeps a small LRU of
+parsed documents and only re-reads when the file's mtime or size changes.
+
+Returned documents are deep-copied so callers can mutate their copy without
+poisoning the cache.
+"""
+from __future__ import annotations
+
+import copy
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as _SafeLoader  # LibYAML, C-accelerated
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+_MAX_ENTRIES = 16
+
+# path -> (mtime_ns, size, parsed document)
+_CACHE: OrderedDict[str, tuple[int, int, Any]] = OrderedDict()
+_LOCK = threading.Lock()
+
+
+def load_yaml_cached(path: str | Path) -> Any:
+    """Load a YAML file, reusing the parsed document while the file is unchanged.
+
+    Returns a deep copy of the cached document (or {} for an empty file).
+    """
+    key = str(path)
+    st = os.stat(key)
+    with _LOCK:
+        entry = _CACHE.get(key)
+        if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            _CACHE.move_to_end(key)
+            return copy.deepcopy(entry[2])
+
+    with open(key, "r", encoding="utf-8") as f:
+        doc = yaml.load(f, Loader=_SafeLoader) or {}
+
+    with _LOCK:
+        _CACHE[key] = (st.st_mtime_ns, st.st_size, doc)
+        _CACHE.move_to_end(key)
+        while len(_CACHE) > _MAX_ENTRIES:
+            _CACHE.popitem(last=False)
+    return copy.deepcopy(doc)
@@ -1,13 +1,26 @@
+import functools
 from pathlib import Path
 import yaml
 from typing import Dict
 
+try:
+    from yaml import CSafeLoader as _Loader  # libyaml bindings, ~10x faster
+except ImportError:  # pragma: no cover - pyyaml built without libyaml
+    from yaml import SafeLoader as _Loader
 
-def load_ground_truth(path: Path) -> Dict[str, dict]:
-    if not path.exists():
-        return {}
-    with open(path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f) or {}
+
+@functools.lru_cache(maxsize=None)
+def _load(path_str: str, _mtime_ns: int) -> Dict[str, dict]:
+    with open(path_str, "r", encoding="utf-8") as f:
+        data = yaml.load(f, Loader=_Loader) or {}
     if not isinstance(data, dict):
         raise ValueError("ground_truth.yaml must contain a mapping from test_id to case definitions")
     return data
+
+
+def load_ground_truth(path: Path) -> Dict[str, dict]:
+    if not path.exists():
+        return {}
+    # Parsed result is cached per (path, mtime) so repeated eval runs in one
+    # process don't re-parse a file that has not changed
+    return _load(str(path), path.stat().st_mtime_ns)
@@ -2,16 +2,41 @@ import json
 from collections import defaultdict
 from typing import Dict, List
 
+try:
+    import orjson  # C JSON parser; also avoids the per-line utf-8 decode
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+_CHUNK_SIZE = 1 << 20  # 1 MiB
+
 
 def load_jsonl(path: str):
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            if not line.strip():
-                continue
+    # Read in 1 MiB chunks and split on newlines ourselves: one read syscall
+    # and one split per megabyte instead of per-line iterator overhead. Both
+    # parsers accept bytes and raise ValueError subclasses on bad lines.
+    loads = orjson.loads if orjson is not None else json.loads
+    with open(path, "rb") as f:
+        buf = b""
+        while True:
+            chunk = f.read(_CHUNK_SIZE)
+            if not chunk:
+                break
+            buf += chunk
+            lines = buf.split(b"\n")
+            buf = lines.pop()  # trailing partial line carries into next chunk
+            for line in lines:
+                if not line.strip():
+                    continue
+                try:
+                    yield loads(line)
+                except ValueError:
+                    continue
+        if buf.strip():
             try:
-                yield json.loads(line)
-            except json.JSONDecodeError:
-                continue
+                yield loads(buf)
+            except ValueError:
+                pass
 
 
 def load_runs(path: str) -> Dict[str, List[dict]]:
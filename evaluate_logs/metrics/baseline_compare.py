@@ -1,18 +1,38 @@
-from typing import Dict, Any, List
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Tuple
 from metrics.aggregate_basic import extract_basic_metrics
 from metrics.timing_breakdown import extract_timing_metrics
 
+# Below this many tests the fork/pickle overhead outweighs the parallelism
+_PARALLEL_MIN_TESTS = 16
+
+# Latency fields mirrored as baseline_<k> and delta_<k> per test
+_LATENCY_FIELDS = (
+    "total_latency_sec",
+    "parsing_latency_sec",
+    "sql_generation_latency_sec",
+    "sql_validation_latency_sec",
+    "data_extract_latency_sec",
+    "chart_llm_latency_sec",
+    "narrative_latency_sec",
+)
+
+
+def _extract_both(item: Tuple[str, List[Dict[str, Any]]]) -> Tuple[str, Dict[str, Any]]:
+    test_id, events = item
+    return test_id, {**extract_basic_metrics(events), **extract_timing_metrics(events)}
+
 
 def _compute_baseline_per_test(baseline_runs: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
-    baseline_results: Dict[str, Dict[str, Any]] = {}
-    for test_id, events in baseline_runs.items():
-        basic = extract_basic_metrics(events)
-        timing = extract_timing_metrics(events)
-        merged: Dict[str, Any] = {}
-        merged.update(basic)
-        merged.update(timing)
-        baseline_results[test_id] = merged
-    return baseline_results
+    items = list(baseline_runs.items())
+    if len(items) < _PARALLEL_MIN_TESTS:
+        return dict(map(_extract_both, items))
+    # Per-test extraction is independent pure-Python CPU work, so it
+    # parallelizes across processes; chunking keeps pickling overhead low
+    with ProcessPoolExecutor() as ex:
+        chunksize = max(1, len(items) // (4 * (os.cpu_count() or 1)))
+        return dict(ex.map(_extract_both, items, chunksize=chunksize))
 
 
 def compare_baselines(current_results: Dict[str, Dict[str, Any]], baseline_runs: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
@@ -22,31 +42,23 @@ def compare_baselines(current_results: Dict[str, Dict[str, Any]], baseline_runs:
         base = baseline_metrics.get(test_id)
         if not base:
             continue
-        entry: Dict[str, Any] = {}
-        entry["baseline_status"] = base.get("status")
-        entry["baseline_total_latency_sec"] = base.get("total_latency_sec")
-        entry["baseline_parsing_latency_sec"] = base.get("parsing_latency_sec")
-        entry["baseline_sql_generation_latency_sec"] = base.get("sql_generation_latency_sec")
-        entry["baseline_sql_validation_latency_sec"] = base.get("sql_validation_latency_sec")
-        entry["baseline_data_extract_latency_sec"] = base.get("data_extract_latency_sec")
-        entry["baseline_chart_llm_latency_sec"] = base.get("chart_llm_latency_sec")
-        entry["baseline_narrative_latency_sec"] = base.get("narrative_latency_sec")
-        entry["baseline_sql_valid_logged"] = base.get("sql_valid_logged")
-        entry["baseline_chart_valid_logged"] = base.get("chart_valid_logged")
-
-        def delta(key):
-            cur_val = cur.get(key)
-            base_val = base.get(key)
-            if isinstance(cur_val, (int, float)) and isinstance(base_val, (int, float)):
-                return cur_val - base_val
-            return None
-
-        entry["delta_total_latency_sec"] = delta("total_latency_sec")
-        entry["delta_parsing_latency_sec"] = delta("parsing_latency_sec")
-        entry["delta_sql_generation_latency_sec"] = delta("sql_generation_latency_sec")
-        entry["delta_sql_validation_latency_sec"] = delta("sql_validation_latency_sec")
-        entry["delta_data_extract_latency_sec"] = delta("data_extract_latency_sec")
-        entry["delta_chart_llm_latency_sec"] = delta("chart_llm_latency_sec")
-        entry["delta_narrative_latency_sec"] = delta("narrative_latency_sec")
+        # Fixed field tuple instead of a per-key closure: one base.get/cur.get
+        # pair per field and no function-call overhead per delta
+        base_get = base.get
+        cur_get = cur.get
+        entry: Dict[str, Any] = {"baseline_status": base_get("status")}
+        for k in _LATENCY_FIELDS:
+            entry["baseline_" + k] = base_get(k)
+        entry["baseline_sql_valid_logged"] = base_get("sql_valid_logged")
+        entry["baseline_chart_valid_logged"] = base_get("chart_valid_logged")
+        for k in _LATENCY_FIELDS:
+            c = cur_get(k)
+            b = base_get(k)
+            # type() instead of isinstance: no MRO walk, and bools never
+            # occur in latency fields
+            if type(c) in (int, float) and type(b) in (int, float):
+                entry["delta_" + k] = c - b
+            else:
+                entry["delta_" + k] = None
         comparison[test_id] = entry
     return comparison
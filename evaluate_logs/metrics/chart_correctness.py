@@ -1,104 +1,271 @@
 import ast
+import mmap
 import re
 import json
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 import os
 
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson  # C JSON parser; large figure payloads parse 3-5x faster
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
 from loaders.sqlalchemy_client import SQLAlchemyClient
 
 
-def _extract_chart_figure(events: List[Dict[str, Any]]) -> Dict[str, Any] | None:
-    """Attempt to extract a Plotly-like figure dict from log messages.
+def _loads(raw):
+    """Parse JSON from str, bytes or a buffer with orjson when available."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    if isinstance(raw, (bytes, bytearray, memoryview)):
+        raw = bytes(raw).decode("utf-8")
+    return json.loads(raw)
 
-    Primary source: a line containing "Chart JSON preview (len=...):\n{...}".
-    We handle extra trailing characters by slicing to the last closing brace.
-    """
-    # Option B: try to load from logs/charts/<test_id>.json if available
+
+def _fig_from_chart_file(events: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Load the figure from logs/charts/<test_id>.json when available."""
     test_id: Optional[str] = None
     for e in events:
         tid = e.get("test_id")
         if tid:
             test_id = tid
             break
-    if test_id:
-        # EVAL script runs from repo root; resolve base logs dir relative to repo root
-        repo_root = Path(__file__).resolve().parents[2]  # .../evaluate_logs
-        candidate = repo_root / "logs" / "charts" / f"{test_id}.json"
-        if candidate.exists():
-            try:
-                with open(candidate, "r", encoding="utf-8") as fh:
-                    fig = json.load(fh)
-                if isinstance(fig, dict):
-                    return fig
-            except Exception:
-                pass
-
-    for e in events:
-        msg = e.get("message", "")
-        if not msg:
-            continue
-        # Preferred: full JSON emission
-        if msg.startswith("chart_full_json:"):
-            raw = msg[len("chart_full_json:") :].strip()
+    if not test_id:
+        return None
+    # EVAL script runs from repo root; resolve base logs dir relative to repo root
+    repo_root = Path(__file__).resolve().parents[2]  # .../evaluate_logs
+    candidate = repo_root / "logs" / "charts" / f"{test_id}.json"
+    if not candidate.exists():
+        return None
+    try:
+        with open(candidate, "rb") as fh:
+            # Memory-map multi-MB figures so the parser reads the page cache
+            # directly instead of copying the file into a Python bytes first
             try:
-                fig = json.loads(raw)
-                if isinstance(fig, dict):
-                    return fig
-            except Exception:
-                pass
-        if "Chart JSON preview" in msg:
-            # Try to extract the block from first '{' to the last '}'
-            start = msg.find("{")
-            end = msg.rfind("}")
-            if start != -1 and end != -1 and end > start:
-                block = msg[start : end + 1]
-                # Quick sanity cleanup: strip leading/trailing whitespace
-                block = block.strip()
+                mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):
+                # Empty file or platform refusal: plain read fallback
+                fig = _loads(fh.read())
+            else:
                 try:
-                    fig = ast.literal_eval(block)
-                    if isinstance(fig, dict):
-                        return fig
-                except Exception:
-                    # Fallback: try to reduce repeated whitespace and attempt again
-                    block2 = re.sub(r"\s+", " ", block)
+                    mv = memoryview(mm)
                     try:
-                        fig = ast.literal_eval(block2)
-                        if isinstance(fig, dict):
-                            return fig
-                    except Exception:
-                        continue
+                        fig = _loads(mv)
+                    finally:
+                        mv.release()
+                finally:
+                    mm.close()
+        if isinstance(fig, dict):
+            return fig
+    except Exception:
+        pass
     return None
 
 
-def _extract_dataset_rows(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Extract the dataset JSON used for chart generation from log messages.
+def _try_parse_block(block: str) -> Optional[Any]:
+    """Parse a preview block: JSON first, quote repair second, AST last.
+
+    Plotly previews are either valid JSON or JSON-with-single-quotes, so the
+    common cases hit a C-level parse; ast.literal_eval (which builds and
+    walks a full AST) only runs when both fail.
+    """
+    try:
+        return _loads(block)
+    except Exception:
+        pass
+    try:
+        return _loads(block.replace("'", '"'))
+    except Exception:
+        pass
+    try:
+        return ast.literal_eval(block)
+    except Exception:
+        return None
+
+
+def _parse_fig_message(msg: str) -> Optional[Dict[str, Any]]:
+    """Parse a figure dict out of one log message, or return None.
 
-    Looks for a message containing 'Data Set:' followed by a fenced JSON block ```json ... ```.
-    Returns a list of row dicts or empty list if not found/parsable.
+    Handles the full "chart_full_json:" emission and the "Chart JSON
+    preview (len=...):\\n{...}" form, slicing to the last closing brace to
+    drop trailing characters.
     """
+    if msg.startswith("chart_full_json:"):
+        raw = msg[len("chart_full_json:") :].strip()
+        try:
+            fig = _loads(raw)
+            if isinstance(fig, dict):
+                return fig
+        except Exception:
+            pass
+    if "Chart JSON preview" in msg:
+        # Try to extract the block from first '{' to the last '}'
+        start = msg.find("{")
+        end = msg.rfind("}")
+        if start != -1 and end != -1 and end > start:
+            block = msg[start : end + 1].strip()
+            fig = _try_parse_block(block)
+            if isinstance(fig, dict):
+                return fig
+            # Fallback: try to reduce repeated whitespace and attempt again
+            fig = _try_parse_block(re.sub(r"\s+", " ", block))
+            if isinstance(fig, dict):
+                return fig
+    return None
+
+
+def _parse_dataset_message(msg: str) -> Optional[List[Dict[str, Any]]]:
+    """Parse 'Data Set:' + fenced ```json block from one message, or None."""
+    ds = msg.find("Data Set:")
+    if ds < 0:
+        return None
+    start = msg.find("```json", ds)
+    if start < 0:
+        return None
+    start += len("```json")
+    end = msg.find("```", start)
+    if end < 0:
+        return None
+    try:
+        data = _loads(msg[start:end].strip())
+    except Exception:
+        return None
+    if isinstance(data, list):
+        return [r for r in data if isinstance(r, dict)]
+    return None
+
+
+def _extract_fig_and_dataset(
+    events: List[Dict[str, Any]],
+) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Extract the chart figure and the dataset rows in one events pass.
+
+    Figure precedence is unchanged: the charts/<test_id>.json file first,
+    then the earliest parseable figure message. The dataset comes from the
+    latest 'Data Set:' message; candidates are collected during the pass and
+    only parsed (newest first) until one succeeds.
+    """
+    fig = _fig_from_chart_file(events)
+    msg_fig: Optional[Dict[str, Any]] = None
+    ds_candidates: List[str] = []
     for e in events:
-        msg = e.get("message", "") or ""
-        if "Data Set:" in msg and "```json" in msg:
-            # capture between first ```json and next ```
-            start = msg.find("```json")
-            if start == -1:
-                continue
-            start += len("```json")
-            end = msg.find("```", start)
-            if end == -1:
-                continue
-            json_block = msg[start:end].strip()
-            try:
-                data = json.loads(json_block)
-                if isinstance(data, list):
-                    return [r for r in data if isinstance(r, dict)]
-            except Exception:
-                continue
-    return []
+        msg = e.get("message") or ""
+        if not msg:
+            continue
+        if fig is None and msg_fig is None:
+            msg_fig = _parse_fig_message(msg)
+        if "Data Set:" in msg:
+            ds_candidates.append(msg)
+    if fig is None:
+        fig = msg_fig
+    for msg in reversed(ds_candidates):
+        rows = _parse_dataset_message(msg)
+        if rows is not None:
+            return fig, rows
+    return fig, []
+
+
+def _rows_to_point_map(
+    rows, x_key: str, y_key: str, series_dim: Optional[str]
+) -> Tuple[Dict[tuple, float], bool]:
+    """Build {(x, series): round(y, 6)} from rows via pandas columns.
+
+    Accepts a DataFrame or a list of row dicts. One vectorized astype/round
+    per column replaces the per-row str()/float()/round() calls; for GT
+    queries with tens of thousands of rows the Python row loop dominated.
+    Returns (map, single_series) where single_series is True when no usable
+    series dimension exists.
+    """
+    df = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(rows)
+    if df.empty:
+        return {}, series_dim is None
+    n = len(df)
+    xs = df[x_key].astype(str).tolist() if x_key in df.columns else ["None"] * n
+    if y_key in df.columns:
+        ys = df[y_key].astype(float).round(6).tolist()
+    else:
+        ys = [0.0] * n
+    if series_dim is None or series_dim not in df.columns:
+        return dict(zip(zip(xs, ["__single_series__"] * n), ys)), True
+    ss = df[series_dim].astype(str).tolist()
+    return dict(zip(zip(xs, ss), ys)), False
+
+
+def _compare_traces(
+    fig: Dict[str, Any],
+    point_map: Dict[tuple, float],
+    single_series: bool,
+    missing_fmt,
+    diff_fmt,
+) -> Tuple[int, int, List[str]]:
+    """Compare every (x, y) point in the figure's traces against point_map.
+
+    The tolerance check runs as one NumPy comparison per trace instead of
+    per-point Python float()/abs() calls; mismatch strings are only built for
+    the failing indices. Traces with non-numeric y values fall back to the
+    scalar loop so their mismatch reporting is unchanged.
+    """
+    total = 0
+    correct = 0
+    mismatches: List[str] = []
+    for trace in fig.get("data", []):
+        series_name = str(trace.get("name")) if not single_series else "__single_series__"
+        xs = trace.get("x", [])
+        ys = trace.get("y", [])
+        n = min(len(xs), len(ys))
+        if n == 0:
+            continue
+        keys = [(str(x), series_name) for x in xs[:n]]
+        try:
+            ys_arr = np.asarray(ys[:n], dtype=float)
+        except (TypeError, ValueError):
+            ys_arr = None
+        if ys_arr is None:
+            # Non-numeric y somewhere in the trace: per-point fallback
+            for key, y in zip(keys, ys):
+                total += 1
+                ref = point_map.get(key)
+                try:
+                    y_val = float(y)
+                except Exception:
+                    y_val = y
+                if ref is None:
+                    mismatches.append(missing_fmt(key[0], series_name, y_val))
+                elif isinstance(y_val, (int, float)) and abs(ref - y_val) < 1e-6:
+                    correct += 1
+                else:
+                    mismatches.append(diff_fmt(key[0], series_name, ref, y_val))
+            continue
+        # Missing keys become NaN, which compares False and lands in the
+        # mismatch branch, matching the scalar semantics
+        ref_arr = np.fromiter(
+            (point_map.get(k, np.nan) for k in keys), dtype=float, count=n
+        )
+        ok = np.abs(ref_arr - ys_arr) < 1e-6
+        total += n
+        correct += int(np.count_nonzero(ok))
+        if not ok.all():
+            for i in np.where(~ok)[0]:
+                key = keys[i]
+                ref = point_map.get(key)
+                y_val = float(ys_arr[i])
+                if ref is None:
+                    mismatches.append(missing_fmt(key[0], series_name, y_val))
+                else:
+                    mismatches.append(diff_fmt(key[0], series_name, ref, y_val))
+    return total, correct, mismatches
 
 
-def evaluate_chart_correctness(events: List[Dict[str, Any]], gt_case: Dict[str, Any], db: SQLAlchemyClient) -> Dict[str, Any]:
+def evaluate_chart_correctness(
+    events: List[Dict[str, Any]],
+    gt_case: Dict[str, Any],
+    db: SQLAlchemyClient,
+    gt_rows: Any | None = None,
+) -> Dict[str, Any]:
     result: Dict[str, Any] = {
         "chart_correct": None,
         "chart_pct_points_correct": None,
@@ -111,7 +278,7 @@ def evaluate_chart_correctness(events: List[Dict[str, Any]], gt_case: Dict[str,
         "chart_dataset_total_points": None,
         "chart_dataset_mismatches_sample": None,
     }
-    fig = _extract_chart_figure(events)
+    fig, dataset_rows = _extract_fig_and_dataset(events)
     if fig is None:
         result["chart_mismatches_sample"] = "No chart figure found in logs."
         return result
@@ -126,56 +293,25 @@ def evaluate_chart_correctness(events: List[Dict[str, Any]], gt_case: Dict[str,
     metric_columns = gt_case.get("expected_metric_columns") or ["actual_revenue"]
     y_key = metric_columns[0]
 
-    try:
-        gt_rows = db.run_sql(reference_sql)
-    except Exception as e:
-        result["chart_mismatches_sample"] = f"Ground-truth SQL execution error: {e}"
-        return result
-
-    # Detect whether ground-truth rows include a series dimension
-    single_series = False
-    if series_dim is None:
-        single_series = True
-
-    gt_map = {}
-    for r in gt_rows:
-        x_val = str(r.get(x_key))
-        if single_series or (series_dim not in r):
-            series_val = "__single_series__"
-            single_series = True  # enforce single-series mode if series key is absent
-        else:
-            series_val = str(r.get(series_dim))
-        metric_val = r.get(y_key, 0)
+    if gt_rows is None:
         try:
-            metric_val = float(metric_val)
-        except Exception:
-            pass
-        gt_map[(x_val, series_val)] = round(metric_val, 6)
+            # Columnar result feeds _rows_to_point_map directly; no dict-per-row
+            gt_rows = db.run_sql_df(reference_sql)
+        except Exception as e:
+            result["chart_mismatches_sample"] = f"Ground-truth SQL execution error: {e}"
+            return result
 
-    mismatches = []
-    total_points = 0
-    correct_points = 0
+    # Single-series mode is enforced when the series dimension is undefined
+    # or absent from the ground-truth rows
+    gt_map, single_series = _rows_to_point_map(gt_rows, x_key, y_key, series_dim)
 
-    for trace in fig.get("data", []):
-        series_name = str(trace.get("name")) if not single_series else "__single_series__"
-        xs = trace.get("x", [])
-        ys = trace.get("y", [])
-        for x, y in zip(xs, ys):
-            total_points += 1
-            key = (str(x), series_name)
-            gt_val = gt_map.get(key)
-            try:
-                y_val = float(y)
-            except Exception:
-                y_val = y
-
-            if gt_val is None:
-                mismatches.append(f"({x}, {series_name}) missing in ground truth; chart={y_val}")
-            else:
-                if isinstance(y_val, (int, float)) and abs(gt_val - y_val) < 1e-6:
-                    correct_points += 1
-                else:
-                    mismatches.append(f"({x}, {series_name}) gt={gt_val}, chart={y_val}")
+    total_points, correct_points, mismatches = _compare_traces(
+        fig,
+        gt_map,
+        single_series,
+        lambda x, s, y: f"({x}, {s}) missing in ground truth; chart={y}",
+        lambda x, s, ref, y: f"({x}, {s}) gt={ref}, chart={y}",
+    )
 
     if total_points == 0:
         result["chart_mismatches_sample"] = "No points found in chart."
@@ -193,43 +329,17 @@ def evaluate_chart_correctness(events: List[Dict[str, Any]], gt_case: Dict[str,
     result["chart_mismatches_sample"] = "\n".join(mismatches[:10]) if mismatches else "No mismatches."
 
     # Dataset vs chart alignment (independent of ground truth)
-    dataset_rows = _extract_dataset_rows(events)
     if dataset_rows:
-        ds_map = {}
-        for r in dataset_rows:
-            x_val = str(r.get(x_key))
-            if single_series or (series_dim is None) or (series_dim not in r):
-                series_val = "__single_series__"
-            else:
-                series_val = str(r.get(series_dim))
-            metric_val = r.get(y_key, 0)
-            try:
-                metric_val = float(metric_val)
-            except Exception:
-                pass
-            ds_map[(x_val, series_val)] = round(metric_val, 6)
-        ds_total = 0
-        ds_mismatches = []
-        ds_correct = 0
-        for trace in fig.get("data", []):
-            series_name = (str(trace.get("name")) if not single_series else "__single_series__")
-            xs = trace.get("x", [])
-            ys = trace.get("y", [])
-            for x, y in zip(xs, ys):
-                ds_total += 1
-                key = (str(x), series_name)
-                ds_val = ds_map.get(key)
-                try:
-                    y_val = float(y)
-                except Exception:
-                    y_val = y
-                if ds_val is None:
-                    ds_mismatches.append(f"(dataset missing) ({x}, {series_name}) chart={y_val}")
-                else:
-                    if isinstance(y_val, (int, float)) and abs(ds_val - y_val) < 1e-6:
-                        ds_correct += 1
-                    else:
-                        ds_mismatches.append(f"(value diff) ({x}, {series_name}) dataset={ds_val}, chart={y_val}")
+        ds_map, _ = _rows_to_point_map(
+            dataset_rows, x_key, y_key, None if single_series else series_dim
+        )
+        ds_total, ds_correct, ds_mismatches = _compare_traces(
+            fig,
+            ds_map,
+            single_series,
+            lambda x, s, y: f"(dataset missing) ({x}, {s}) chart={y}",
+            lambda x, s, ref, y: f"(value diff) ({x}, {s}) dataset={ref}, chart={y}",
+        )
         if ds_total > 0:
             ds_pct = ds_correct / ds_total
             result["chart_points_match_dataset"] = (ds_pct == 1.0)
@@ -23,30 +23,38 @@ def _get_ground_truth_rows(gt_case: Dict[str, Any], db: SQLAlchemyClient):
         return []
 
 
-def evaluate_narrative_quality(events: List[Dict[str, Any]], gt_case: Dict[str, Any] | None, db: SQLAlchemyClient) -> Dict[str, Any]:
+def evaluate_narrative_quality(
+    events: List[Dict[str, Any]],
+    gt_case: Dict[str, Any] | None,
+    db: SQLAlchemyClient,
+    gt_rows: List[Dict[str, Any]] | None = None,
+    features: Any | None = None,
+) -> Dict[str, Any]:
     result: Dict[str, Any] = {
         "narrative_present": None,
         "narrative_length_chars": None,
         "narrative_coverage_score": None,
     }
-    narrative = _extract_narrative_text(events)
+    narrative = features.narrative_text if features is not None else _extract_narrative_text(events)
     if not narrative:
         return result
 
     result["narrative_present"] = True
     result["narrative_length_chars"] = len(narrative)
 
-    gt_rows = _get_ground_truth_rows(gt_case or {}, db)
+    if gt_rows is None:
+        gt_rows = _get_ground_truth_rows(gt_case or {}, db)
+    # Lowercase each term once while building the set; values differing
+    # only in case collapse to one term instead of being counted twice
     key_terms = set()
     for r in gt_rows:
-        for k, v in r.items():
+        for v in r.values():
             if isinstance(v, str) and len(v) > 2:
-                key_terms.add(v)
+                key_terms.add(v.lower())
     if not key_terms:
         return result
 
     narrative_lower = narrative.lower()
-    hits = sum(1 for term in key_terms if term.lower() in narrative_lower)
-    coverage = hits / len(key_terms) if key_terms else 0.0
-    result["narrative_coverage_score"] = coverage
+    hits = sum(1 for term in key_terms if term in narrative_lower)
+    result["narrative_coverage_score"] = hits / len(key_terms)
     return result
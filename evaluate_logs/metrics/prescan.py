@@ -0,0 +1,53 @@
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from metrics.sql_correctness import _SQL_PAT
+
+
+class EventFeatures(NamedTuple):
+    """Per-test features lifted out of the event list in a single pass."""
+    generated_sql: Optional[str]
+    narrative_text: Optional[str]
+
+
+def prescan_events(events: List[Dict[str, Any]]) -> EventFeatures:
+    """Walk the events once and collect the message-level extractions that
+    several metrics would otherwise each re-scan for.
+
+    The SQL tracking mirrors sql_correctness._extract_generated_sql (same
+    pattern, same last-validated-OK preference); the narrative is the first
+    event carrying a narrative/narrative_text field. The aggregate scanners
+    (basic, timing, cost) keep their own loops -- each is already a single
+    pass over fields this prescan does not touch.
+    """
+    last_candidate_sql: Optional[str] = None
+    last_ok_sql: Optional[str] = None
+    current_candidate_sql: Optional[str] = None
+    narrative: Optional[str] = None
+    _search = _SQL_PAT.search
+
+    for e in events:
+        if narrative is None:
+            if "narrative" in e:
+                narrative = e["narrative"]
+            elif "narrative_text" in e:
+                narrative = e["narrative_text"]
+
+        msg = e.get("message", "") or ""
+        if not msg:
+            continue
+        m = _search(msg)
+        if m is None:
+            continue
+        if m.lastgroup == "ok":
+            if current_candidate_sql:
+                last_ok_sql = current_candidate_sql
+        else:
+            sql = m.group(m.lastgroup).strip()
+            if sql:
+                last_candidate_sql = sql
+                current_candidate_sql = sql
+
+    return EventFeatures(
+        generated_sql=last_ok_sql or last_candidate_sql,
+        narrative_text=narrative,
+    )
@@ -1,10 +1,22 @@
+from collections import Counter
+import re
 from typing import Dict, Any, List
 from datetime import datetime
 
-from deepdiff import DeepDiff
 from loaders.sqlalchemy_client import SQLAlchemyClient
 
 
+# One alternation covers the three message shapes _extract_generated_sql
+# cares about, so each message is scanned once; lastgroup tells which shape
+# matched. DOTALL lets the SQL capture span the newline after "(len=...):".
+_SQL_PAT = re.compile(
+    r"Running SQL:\s*(?P<run>.+)"
+    r"|Validating SQL[^)]*\):\s*(?P<val>.+)"
+    r"|(?P<ok>SQL validation PASSED|Validation result: OK)",
+    re.DOTALL,
+)
+
+
 def _extract_generated_sql(events: List[Dict[str, Any]]) -> str | None:
     """Extract the best SQL candidate from logs, preferring the last validated-OK SQL.
 
@@ -18,63 +30,110 @@ def _extract_generated_sql(events: List[Dict[str, Any]]) -> str | None:
     last_candidate_sql: str | None = None
     last_ok_sql: str | None = None
     current_candidate_sql: str | None = None
+    _search = _SQL_PAT.search
 
     for e in events:
         msg = e.get("message", "") or ""
         if not msg:
             continue
 
-        # New candidate from "Running SQL:" (may not have validation lines)
-        if "Running SQL:" in msg:
-            sql = msg.split("Running SQL:", 1)[1].strip()
-            if sql:
-                last_candidate_sql = sql
-                current_candidate_sql = sql
-            continue
-
-        # New candidate from "Validating SQL (len=...):\n<sql>"
-        if "Validating SQL" in msg and "):" in msg:
-            idx = msg.find("):")
-            if idx != -1:
-                sql = msg[idx + 2 :].strip()
-                if sql:
-                    last_candidate_sql = sql
-                    current_candidate_sql = sql
+        m = _search(msg)
+        if m is None:
             continue
-
-        # Mark current candidate as OK when we see a success line
-        if ("SQL validation PASSED" in msg) or ("Validation result: OK" in msg):
+        if m.lastgroup == "ok":
+            # Mark current candidate as OK when we see a success line
             if current_candidate_sql:
                 last_ok_sql = current_candidate_sql
-            continue
+        else:
+            # New candidate from "Running SQL:" or "Validating SQL (len=...):"
+            sql = m.group(m.lastgroup).strip()
+            if sql:
+                last_candidate_sql = sql
+                current_candidate_sql = sql
 
     # Prefer the last OK SQL, else the last seen candidate
     return last_ok_sql or last_candidate_sql
 
 
-def _normalize_rows(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    normed = []
+def _normalize_rows_sorted(rows: List[Dict[str, Any]]) -> Counter:
+    """Schema-agnostic fallback: key each row by its sorted (column, value)
+    items. Used when row schemas diverge within or between result sets."""
+    counter: Counter = Counter()
     for r in rows:
-        out = {}
+        items = []
         for k, v in r.items():
             if isinstance(v, float):
-                out[k] = round(v, 6)
+                items.append((k, round(v, 6)))
             elif isinstance(v, datetime):
-                out[k] = v.isoformat()
+                items.append((k, v.isoformat()))
             else:
-                out[k] = v
-        normed.append(out)
-    return sorted(normed, key=lambda row: tuple(row.values()))
+                items.append((k, v))
+        items.sort()
+        counter[tuple(items)] += 1
+    return counter
+
 
+def _normalize_rows(rows: List[Dict[str, Any]], cols: tuple | None = None) -> tuple:
+    """Normalize rows into a Counter multiset and return (cols, counter).
 
-def evaluate_sql_correctness(events: List[Dict[str, Any]], gt_case: Dict[str, Any], db: SQLAlchemyClient) -> Dict[str, Any]:
+    The correctness question is "are these two multisets of rows equal?", so
+    a Counter comparison answers it directly -- no sort, no diff tree.
+    Floats are rounded to 6 digits to keep the old tolerance.
+
+    SQL results have one column tuple for every row, so each key is just the
+    row's values in that fixed order -- O(C) per row instead of sorting its
+    items. The column tuple is taken from the first row unless the caller
+    passes the other side's, which keeps both sides keyed identically. Rows
+    that do not fit the column tuple trigger the sorted-items fallback,
+    signalled by cols=None in the return value.
+    """
+    if not rows:
+        return cols, Counter()
+    if cols is None:
+        cols = tuple(rows[0].keys())
+    counter: Counter = Counter()
+    try:
+        for r in rows:
+            if len(r) != len(cols):
+                raise KeyError
+            vals = []
+            for c in cols:
+                v = r[c]
+                if isinstance(v, float):
+                    vals.append(round(v, 6))
+                elif isinstance(v, datetime):
+                    vals.append(v.isoformat())
+                else:
+                    vals.append(v)
+            counter[tuple(vals)] += 1
+    except KeyError:
+        return None, _normalize_rows_sorted(rows)
+    return cols, counter
+
+
+def _format_row_sample(counter: Counter, cols: tuple | None, limit: int = 5) -> str:
+    if cols is None:
+        # fallback keys are (column, value) item tuples already
+        return "; ".join(str(dict(row)) for row, _n in list(counter.items())[:limit])
+    return "; ".join(str(dict(zip(cols, row))) for row, _n in list(counter.items())[:limit])
+
+
+def evaluate_sql_correctness(
+    events: List[Dict[str, Any]],
+    gt_case: Dict[str, Any],
+    db: SQLAlchemyClient,
+    gt_rows: List[Dict[str, Any]] | None = None,
+    features: Any | None = None,
+) -> Dict[str, Any]:
     result: Dict[str, Any] = {
         "sql_correct": None,
         "sql_diff_summary": None,
         "sql_row_count_generated": None,
         "sql_row_count_ground_truth": None,
     }
-    generated_sql = _extract_generated_sql(events)
+    # The caller's prescan already walked the events for the SQL when a
+    # features bundle is supplied
+    generated_sql = features.generated_sql if features is not None else _extract_generated_sql(events)
     if not generated_sql:
         result["sql_diff_summary"] = "No generated SQL found in logs."
         return result
@@ -86,7 +145,8 @@ def evaluate_sql_correctness(events: List[Dict[str, Any]], gt_case: Dict[str, An
 
     try:
         gen_rows = db.run_sql(generated_sql)
-        gt_rows = db.run_sql(reference_sql)
+        if gt_rows is None:
+            gt_rows = db.run_sql(reference_sql)
     except Exception as e:
         result["sql_diff_summary"] = f"SQL execution error: {e}"
         return result
@@ -94,14 +154,41 @@ def evaluate_sql_correctness(events: List[Dict[str, Any]], gt_case: Dict[str, An
     result["sql_row_count_generated"] = len(gen_rows)
     result["sql_row_count_ground_truth"] = len(gt_rows)
 
-    gen_norm = _normalize_rows(gen_rows)
-    gt_norm = _normalize_rows(gt_rows)
+    # Correct SQL usually reproduces the reference rows exactly, so try a
+    # plain list comparison first; exact equality implies normalized
+    # equality, and the C-level compare skips the per-row normalization
+    if gen_rows == gt_rows:
+        result["sql_correct"] = True
+        result["sql_diff_summary"] = "No differences."
+        return result
+
+    gen_cols, gen_counter = _normalize_rows(gen_rows)
+    gt_cols, gt_counter = _normalize_rows(gt_rows, cols=gen_cols)
+    if gen_cols != gt_cols:
+        # Differing column tuples (or a fallback on one side): re-key both
+        # sides schema-agnostically so column order cannot cause a miss
+        gen_counter = _normalize_rows_sorted(gen_rows)
+        gt_counter = _normalize_rows_sorted(gt_rows)
+        gen_cols = None
 
-    diff = DeepDiff(gt_norm, gen_norm, significant_digits=6)
-    if diff == {}:
+    if gen_counter == gt_counter:
         result["sql_correct"] = True
         result["sql_diff_summary"] = "No differences."
     else:
         result["sql_correct"] = False
-        result["sql_diff_summary"] = str(diff)[:2000]
+        # Counter subtraction gives the symmetric difference directly
+        only_in_gt = gt_counter - gen_counter
+        only_in_gen = gen_counter - gt_counter
+        parts = []
+        if only_in_gt:
+            parts.append(
+                f"rows only in ground truth ({sum(only_in_gt.values())}): "
+                + _format_row_sample(only_in_gt, gen_cols)
+            )
+        if only_in_gen:
+            parts.append(
+                f"rows only in generated ({sum(only_in_gen.values())}): "
+                + _format_row_sample(only_in_gen, gen_cols)
+            )
+        result["sql_diff_summary"] = " | ".join(parts)[:2000]
     return result
@@ -1,16 +1,12 @@
+import functools
+import re
 from datetime import datetime
 from typing import List, Dict, Any
 
 
+@functools.lru_cache(maxsize=4096)
 def parse_ts(ts: str) -> datetime:
-    return datetime.fromisoformat(ts.replace("Z", ""))
-
-
-def _first_ts(events, predicate):
-    for e in events:
-        if predicate(e):
-            return parse_ts(e["timestamp"])
-    return None
+    return datetime.fromisoformat(ts[:-1] if ts.endswith("Z") else ts)
 
 
 def _delta(start, end):
@@ -19,30 +15,70 @@ def _delta(start, end):
     return None
 
 
-def extract_timing_metrics(events: List[Dict[str, Any]]) -> Dict[str, Any]:
-    parsing_start = _first_ts(events, lambda e: "Parsing user query" in e.get("message", ""))
-    parsing_end = _first_ts(events, lambda e: e.get("event") == "progress" and e.get("message") == "Parsing completed.")
+# The ten "message contains X" predicates compile into one alternation, so
+# each message is scanned once by the regex engine instead of once per
+# needle. Group number identifies which needle matched.
+_NEEDLES = (
+    "Parsing user query",                   # parsing_start
+    "LLM returned SQL",                     # sql_gen_end
+    "Validating SQL",                       # sql_val_start
+    "SQL validation PASSED",                # sql_val_end
+    "SQL validation FAILED",                # sql_val_end
+    "Executing SQL and loading DataFrame",  # data_start
+    "Extracted df shape",                   # data_end
+    "Sending charting prompt to LLM",       # chart_llm_start
+    "LLM returned charting response",       # chart_llm_end
+    "Chart rendered. Valid",                # narrative_start
+)
+_NEEDLE_RE = re.compile("|".join(f"({re.escape(n)})" for n in _NEEDLES))
 
-    sql_gen_start = _first_ts(events, lambda e: e.get("event") == "progress" and e.get("message", "").startswith("Extracting data for question"))
-    sql_gen_end = _first_ts(events, lambda e: "LLM returned SQL" in e.get("message", ""))
+# Slot layout: 0 parsing_start, 1 parsing_end, 2 sql_gen_start,
+# 3 sql_gen_end, 4 sql_val_start, 5 sql_val_end, 6 data_start, 7 data_end,
+# 8 chart_llm_start, 9 chart_llm_end, 10 narrative_start, 11 narrative_end
+_NEEDLE_SLOT = {1: 0, 2: 3, 3: 4, 4: 5, 5: 5, 6: 6, 7: 7, 8: 8, 9: 9, 10: 10}
 
-    sql_val_start = _first_ts(events, lambda e: "Validating SQL" in e.get("message", ""))
-    sql_val_end = _first_ts(events, lambda e: "SQL validation PASSED" in e.get("message", "") or "SQL validation FAILED" in e.get("message", ""))
 
-    data_start = _first_ts(events, lambda e: "Executing SQL and loading DataFrame" in e.get("message", ""))
-    data_end = _first_ts(events, lambda e: "Extracted df shape" in e.get("message", ""))
+def extract_timing_metrics(events: List[Dict[str, Any]]) -> Dict[str, Any]:
+    # One pass over the events; each slot keeps its first-seen raw timestamp
+    # string and the loop exits early once every slot is populated. Parsing
+    # happens after the scan -- at most twelve fromisoformat calls per test.
+    slots: list = [None] * 12
+    remaining = 12
+    _finditer = _NEEDLE_RE.finditer
+    _slot_of = _NEEDLE_SLOT.__getitem__
+
+    for e in events:
+        msg = e.get("message", "") or ""
+        ev = e.get("event")
+
+        if msg:
+            for m in _finditer(msg):
+                si = _slot_of(m.lastindex)
+                if slots[si] is None:
+                    slots[si] = e["timestamp"]
+                    remaining -= 1
 
-    chart_llm_start = _first_ts(events, lambda e: "Sending charting prompt to LLM" in e.get("message", ""))
-    chart_llm_end = _first_ts(events, lambda e: "LLM returned charting response" in e.get("message", ""))
+        if ev == "progress":
+            if slots[1] is None and msg == "Parsing completed.":
+                slots[1] = e["timestamp"]
+                remaining -= 1
+            elif slots[2] is None and msg.startswith("Extracting data for question"):
+                slots[2] = e["timestamp"]
+                remaining -= 1
+        elif ev == "dq_narrative_rendered" and slots[11] is None:
+            slots[11] = e["timestamp"]
+            remaining -= 1
 
-    narrative_start = _first_ts(events, lambda e: "Chart rendered. Valid" in e.get("message", ""))
-    narrative_end = _first_ts(events, lambda e: e.get("event") == "dq_narrative_rendered")
+        if remaining == 0:
+            break
 
+    _pts = parse_ts
+    parsed = [_pts(ts) if ts else None for ts in slots]
     return {
-        "parsing_latency_sec": _delta(parsing_start, parsing_end),
-        "sql_generation_latency_sec": _delta(sql_gen_start, sql_gen_end),
-        "sql_validation_latency_sec": _delta(sql_val_start, sql_val_end),
-        "data_extract_latency_sec": _delta(data_start, data_end),
-        "chart_llm_latency_sec": _delta(chart_llm_start, chart_llm_end),
-        "narrative_latency_sec": _delta(narrative_start, narrative_end),
+        "parsing_latency_sec": _delta(parsed[0], parsed[1]),
+        "sql_generation_latency_sec": _delta(parsed[2], parsed[3]),
+        "sql_validation_latency_sec": _delta(parsed[4], parsed[5]),
+        "data_extract_latency_sec": _delta(parsed[6], parsed[7]),
+        "chart_llm_latency_sec": _delta(parsed[8], parsed[9]),
+        "narrative_latency_sec": _delta(parsed[10], parsed[11]),
     }
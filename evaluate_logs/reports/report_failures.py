@@ -1,31 +1,27 @@
 from pathlib import Path
-from typing import Dict, Any
+from typing import List, Tuple
 
+from reports.test_summary import TestSummary
 
-def generate_failure_report(results: Dict[str, Dict[str, Any]], output_path: Path) -> None:
-    lines = []
-    lines.append("# Failure Report\n")
-    failures = []
-    for tid, r in results.items():
-        status = r.get("status")
-        sql_correct = r.get("sql_correct")
-        chart_correct = r.get("chart_correct")
-        if status != "ok" or sql_correct is False or chart_correct is False:
-            failures.append((tid, r))
+
+def generate_failure_report(summaries: List[Tuple[str, TestSummary]], output_path: Path) -> None:
+    """Write failures.md from the pre-classified (test_id, TestSummary)
+    pairs shared with the markdown report."""
+    failures = [(tid, s) for tid, s in summaries if s.failed]
 
     if not failures:
-        lines.append("No failures detected.")
-        output_path.write_text("\n".join(lines), encoding="utf-8")
+        output_path.write_text("# Failure Report\n\nNo failures detected.", encoding="utf-8")
         return
 
+    lines = ["# Failure Report\n"]
     lines.append(f"Total failing tests: **{len(failures)}**\n")
-    for tid, r in failures:
+    for tid, s in failures:
         lines.append(f"## Test `{tid}`")
-        lines.append(f"- Query: `{r.get('user_query', '')}`")
-        lines.append(f"- Status: {r.get('status')}")
-        lines.append(f"- SQL Correct: {r.get('sql_correct')}")
-        lines.append(f"- SQL Diff: {str(r.get('sql_diff_summary', ''))[:500]}")
-        lines.append(f"- Chart Correct: {r.get('chart_correct')}")
-        lines.append(f"- Chart Mismatches: {r.get('chart_mismatches_sample', '')}")
+        lines.append(f"- Query: `{s.user_query}`")
+        lines.append(f"- Status: {s.status}")
+        lines.append(f"- SQL Correct: {s.sql_correct}")
+        lines.append(f"- SQL Diff: {str(s.sql_diff_summary)[:500]}")
+        lines.append(f"- Chart Correct: {s.chart_correct}")
+        lines.append(f"- Chart Mismatches: {s.chart_mismatches_sample}")
         lines.append("")
     output_path.write_text("\n".join(lines), encoding="utf-8")
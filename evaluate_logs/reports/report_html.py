@@ -1,14 +1,10 @@
+import html
 from pathlib import Path
 
+# 64 KiB keeps memory flat regardless of report size
+_CHUNK_SIZE = 65536
 
-def generate_html_report(results, output_path: Path) -> None:
-    md_path = output_path.parent / "report.md"
-    if not md_path.exists():
-        html = "<html><body><h1>No Markdown report found</h1></body></html>"
-        output_path.write_text(html, encoding="utf-8")
-        return
-    md_text = md_path.read_text(encoding="utf-8")
-    html = f"""<!DOCTYPE html>
+_HEADER = """<!DOCTYPE html>
 <html>
 <head>
   <meta charset='utf-8' />
@@ -16,8 +12,27 @@ def generate_html_report(results, output_path: Path) -> None:
 </head>
 <body>
   <h1>Evaluation Report (Markdown View)</h1>
-  <pre>{md_text}</pre>
+  <pre>"""
+
+_FOOTER = """</pre>
 </body>
 </html>
 """
-    output_path.write_text(html, encoding="utf-8")
+
+
+def generate_html_report(results, output_path: Path) -> None:
+    md_path = output_path.parent / "report.md"
+    if not md_path.exists():
+        output_path.write_text(
+            "<html><body><h1>No Markdown report found</h1></body></html>",
+            encoding="utf-8",
+        )
+        return
+    # Stream the markdown through in fixed-size chunks instead of slurping
+    # it into one f-string; escaping also keeps a literal </pre> in the
+    # report from breaking the page
+    with output_path.open("w", encoding="utf-8") as out, md_path.open("r", encoding="utf-8") as src:
+        out.write(_HEADER)
+        for chunk in iter(lambda: src.read(_CHUNK_SIZE), ""):
+            out.write(html.escape(chunk))
+        out.write(_FOOTER)
@@ -1,20 +1,78 @@
 from pathlib import Path
-from typing import Dict, Any, List
-import plotly.graph_objects as go
+from typing import Dict, Any, Optional
 
+import numpy as np
 
-def generate_summary_plots(results: Dict[str, Dict[str, Any]], output_dir: Path) -> None:
-    latencies: List[float] = [
-        r.get("total_latency_sec")
-        for r in results.values()
-        if isinstance(r.get("total_latency_sec"), (int, float))
+_WIDTH = 640
+_HEIGHT = 360
+_MARGIN = 48
+
+
+def _svg_bars(counts: np.ndarray, edges: np.ndarray, title: str,
+              x_label: str, y_label: str) -> str:
+    """Render histogram bars as a small standalone SVG document."""
+    plot_w = _WIDTH - 2 * _MARGIN
+    plot_h = _HEIGHT - 2 * _MARGIN
+    max_count = int(counts.max()) if counts.size else 1
+    bar_w = plot_w / max(len(counts), 1)
+
+    parts = [
+        f"<svg xmlns='http://www.w3.org/2000/svg' width='{_WIDTH}' height='{_HEIGHT}' "
+        f"font-family='sans-serif' font-size='11'>",
+        f"<text x='{_WIDTH / 2:.0f}' y='20' text-anchor='middle' font-size='14'>{title}</text>",
+        # axes
+        f"<line x1='{_MARGIN}' y1='{_HEIGHT - _MARGIN}' x2='{_WIDTH - _MARGIN}' "
+        f"y2='{_HEIGHT - _MARGIN}' stroke='black'/>",
+        f"<line x1='{_MARGIN}' y1='{_MARGIN}' x2='{_MARGIN}' y2='{_HEIGHT - _MARGIN}' stroke='black'/>",
+        f"<text x='{_WIDTH / 2:.0f}' y='{_HEIGHT - 8}' text-anchor='middle'>{x_label}</text>",
+        f"<text x='14' y='{_HEIGHT / 2:.0f}' text-anchor='middle' "
+        f"transform='rotate(-90 14 {_HEIGHT / 2:.0f})'>{y_label}</text>",
+        # y-axis extremes
+        f"<text x='{_MARGIN - 4}' y='{_HEIGHT - _MARGIN + 4}' text-anchor='end'>0</text>",
+        f"<text x='{_MARGIN - 4}' y='{_MARGIN + 4}' text-anchor='end'>{max_count}</text>",
     ]
-    if latencies:
-        fig_hist = go.Figure()
-        fig_hist.add_trace(go.Histogram(x=latencies))
-        fig_hist.update_layout(
+    for i, count in enumerate(counts):
+        h = plot_h * (int(count) / max_count)
+        x = _MARGIN + i * bar_w
+        y = _HEIGHT - _MARGIN - h
+        parts.append(
+            f"<rect x='{x:.1f}' y='{y:.1f}' width='{bar_w - 1:.1f}' height='{h:.1f}' "
+            f"fill='steelblue'><title>[{edges[i]:.2f}, {edges[i + 1]:.2f}): {int(count)}</title></rect>"
+        )
+    # x-axis extremes
+    if edges.size:
+        parts.append(
+            f"<text x='{_MARGIN}' y='{_HEIGHT - _MARGIN + 14}' text-anchor='middle'>{edges[0]:.2f}</text>"
+        )
+        parts.append(
+            f"<text x='{_WIDTH - _MARGIN}' y='{_HEIGHT - _MARGIN + 14}' "
+            f"text-anchor='middle'>{edges[-1]:.2f}</text>"
+        )
+    parts.append("</svg>")
+    return "\n".join(parts)
+
+
+def generate_summary_plots(results: Dict[str, Dict[str, Any]], output_dir: Path,
+                           shared: Optional[Dict[str, Any]] = None) -> None:
+    # The markdown report already extracted the latency column; reuse its
+    # array when available instead of walking results again
+    latencies = shared.get("lat_arr") if shared else None
+    if latencies is None:
+        latencies = np.fromiter(
+            (
+                r.get("total_latency_sec")
+                for r in results.values()
+                if isinstance(r.get("total_latency_sec"), (int, float))
+            ),
+            dtype=np.float64,
+        )
+    if latencies.size:
+        counts, edges = np.histogram(latencies, bins="auto")
+        svg = _svg_bars(
+            counts,
+            edges,
             title="Total Latency Distribution (sec)",
-            xaxis_title="Latency (sec)",
-            yaxis_title="Count",
+            x_label="Latency (sec)",
+            y_label="Count",
         )
-        fig_hist.write_html(str(output_dir / "latency_hist.html"), include_plotlyjs="cdn")
+        (output_dir / "latency_hist.svg").write_text(svg, encoding="utf-8")
@@ -0,0 +1,57 @@
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+
+class TestSummary(NamedTuple):
+    """The per-test fields the report generators read, extracted once.
+
+    Numeric fields are normalized to None when absent or non-numeric so
+    consumers can test `is not None` instead of repeating isinstance
+    checks per report.
+    """
+    status: Any
+    user_query: Any
+    sql_correct: Any
+    sql_diff_summary: Any
+    chart_correct: Any
+    chart_mismatches_sample: Any
+    dataset_total_points: Optional[int]
+    dataset_mismatch_count: Optional[int]
+    total_latency_sec: Optional[float]
+    total_tokens: Optional[float]
+    total_cost_usd: Optional[float]
+
+    @property
+    def failed(self) -> bool:
+        return self.status != "ok" or self.sql_correct is False or self.chart_correct is False
+
+
+def summarize_results(results: Dict[str, Dict[str, Any]]) -> List[Tuple[str, TestSummary]]:
+    """Classify every result dict into a TestSummary in one traversal.
+
+    Both the markdown and failure reports consume this list, so the result
+    dicts are only walked once for the whole report phase.
+    """
+    summaries: List[Tuple[str, TestSummary]] = []
+    for tid, r in results.items():
+        tp = r.get("chart_dataset_total_points")
+        mc = r.get("chart_dataset_mismatch_count")
+        tl = r.get("total_latency_sec")
+        tt = r.get("total_tokens")
+        tc = r.get("total_cost_usd")
+        summaries.append((
+            tid,
+            TestSummary(
+                status=r.get("status", "n/a"),
+                user_query=r.get("user_query", ""),
+                sql_correct=r.get("sql_correct"),
+                sql_diff_summary=r.get("sql_diff_summary", ""),
+                chart_correct=r.get("chart_correct"),
+                chart_mismatches_sample=r.get("chart_mismatches_sample", ""),
+                dataset_total_points=tp if isinstance(tp, int) else None,
+                dataset_mismatch_count=mc if isinstance(mc, int) else None,
+                total_latency_sec=tl if isinstance(tl, (int, float)) else None,
+                total_tokens=tt if isinstance(tt, (int, float)) else None,
+                total_cost_usd=tc if isinstance(tc, (int, float)) else None,
+            ),
+        ))
+    return summaries
@@ -1,8 +1,16 @@
 import json
 import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
+from types import MappingProxyType
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:  # optional fast path; stdlib json works fine without it
+    orjson = None
+
 load_dotenv()
 
 from loaders.log_loader import load_runs
@@ -10,6 +18,7 @@ from loaders.ground_truth_loader import load_ground_truth
 from loaders.sqlalchemy_client import SQLAlchemyClient
 from metrics.aggregate_basic import extract_basic_metrics
 from metrics.timing_breakdown import extract_timing_metrics
+from metrics.prescan import prescan_events
 from metrics.sql_correctness import evaluate_sql_correctness
 from metrics.chart_correctness import evaluate_chart_correctness
 from metrics.narrative_ragas import evaluate_narrative_quality
@@ -19,6 +28,7 @@ from reports.report_markdown import generate_markdown_report
 from reports.report_html import generate_html_report
 from reports.report_failures import generate_failure_report
 from reports.summary_charts import generate_summary_plots
+from reports.test_summary import summarize_results
 
 
 # Make evaluation directory relative to this script's folder to avoid CWD issues
@@ -43,57 +53,117 @@ def ensure_structure():
         gt_path.write_text("# Add ground truth cases here\n", encoding="utf-8")
 
 
+# Below this many tests the pool spin-up outweighs the parallel win; run serially
+_PARALLEL_MIN_TESTS = 16
+
+# Fields emitted for a test with no ground truth; built once, read-only, and
+# merged in with a single update() instead of three per-test dict literals
+_NO_GT_RESULT = MappingProxyType({
+    "sql_correct": None,
+    "sql_diff_summary": "No ground truth found for this test_id.",
+    "chart_correct": None,
+    "chart_pct_points_correct": None,
+    "chart_mismatch_count": None,
+    "chart_total_points": None,
+    "chart_mismatches_sample": "No ground truth found for this test_id.",
+    "narrative_present": None,
+    "narrative_length_chars": None,
+    "narrative_coverage_score": None,
+})
+
+
+def _write_result(path: Path, result: dict) -> None:
+    if orjson is not None:
+        # C-extension encoder plus one write_bytes call; OPT_SERIALIZE_NUMPY
+        # covers any numpy scalars the metrics let through
+        path.write_bytes(
+            orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+        )
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+
+
+def _eval_one(test_id: str, events: list, gt_case: dict | None, per_test_dir: Path,
+              db: SQLAlchemyClient | None = None, io_pool: ThreadPoolExecutor | None = None) -> tuple[str, dict]:
+    """Evaluate a single test run and write its per-test JSON.
+
+    Standalone so it can run in a worker process; the DB client is built
+    inside the worker (engines do not pickle) unless one is passed in by
+    the serial path. When the serial path supplies an io_pool, the JSON
+    write is handed off so it overlaps with the next test's compute.
+    """
+    if db is None:
+        db = SQLAlchemyClient()
+
+    result: dict = {}
+    basic = extract_basic_metrics(events)
+    result.update(basic)
+
+    timing = extract_timing_metrics(events)
+    result.update(timing)
+
+    if gt_case:
+        # Run reference_sql once per test; the three evaluators below each
+        # need the same rows, so share them instead of re-querying
+        gt_rows = None
+        if gt_case.get("reference_sql"):
+            try:
+                gt_rows = db.run_sql(gt_case["reference_sql"])
+            except Exception:
+                gt_rows = None  # evaluators fall back and report the error
+
+        # One shared walk extracts the message-level features the SQL and
+        # narrative evaluators would otherwise each re-scan the events for
+        features = prescan_events(events)
+        result.update(evaluate_sql_correctness(events, gt_case, db, gt_rows=gt_rows, features=features))
+        result.update(evaluate_chart_correctness(events, gt_case, db, gt_rows=gt_rows))
+        result.update(evaluate_narrative_quality(events, gt_case, db, gt_rows=gt_rows, features=features))
+    else:
+        result.update(_NO_GT_RESULT)
+
+    cost = extract_cost_metrics(events)
+    result.update(cost)
+
+    out_path = per_test_dir / f"{test_id}.json"
+    if io_pool is not None:
+        io_pool.submit(_write_result, out_path, result)
+    else:
+        _write_result(out_path, result)
+
+    return test_id, result
+
+
 def evaluate(logfile: str, baseline_logfile: str | None = None):
     ensure_structure()
     runs = load_runs(logfile)
     ground_truth = load_ground_truth(EVAL_DIR / "ground_truth.yaml")
-    db = SQLAlchemyClient()
 
     all_results: dict[str, dict] = {}
     per_test_dir = EVAL_DIR / "output" / "per_test"
-
-    for test_id, events in runs.items():
-        result: dict = {}
-        basic = extract_basic_metrics(events)
-        result.update(basic)
-
-        timing = extract_timing_metrics(events)
-        result.update(timing)
-
-        gt_case = ground_truth.get(test_id)
-
-        if gt_case:
-            sql_eval = evaluate_sql_correctness(events, gt_case, db)
-            result.update(sql_eval)
-        else:
-            result["sql_correct"] = None
-            result["sql_diff_summary"] = "No ground truth found for this test_id."
-
-        if gt_case:
-            chart_eval = evaluate_chart_correctness(events, gt_case, db)
-            result.update(chart_eval)
-        else:
-            result["chart_correct"] = None
-            result["chart_pct_points_correct"] = None
-            result["chart_mismatch_count"] = None
-            result["chart_total_points"] = None
-            result["chart_mismatches_sample"] = "No ground truth found for this test_id."
-
-        narrative_metrics = evaluate_narrative_quality(events, gt_case, db) if gt_case else {
-            "narrative_present": None,
-            "narrative_length_chars": None,
-            "narrative_coverage_score": None,
-        }
-        result.update(narrative_metrics)
-
-        cost = extract_cost_metrics(events)
-        result.update(cost)
-
-        all_results[test_id] = result
-
-        per_test_dir.mkdir(parents=True, exist_ok=True)
-        with open(per_test_dir / f"{test_id}.json", "w", encoding="utf-8") as f:
-            json.dump(result, f, indent=2)
+    per_test_dir.mkdir(parents=True, exist_ok=True)
+
+    if len(runs) < _PARALLEL_MIN_TESTS:
+        db = SQLAlchemyClient()
+        # JSON writes go to a small IO pool so the loop moves straight on
+        # to the next test's compute; shutdown(wait=True) drains them
+        with ThreadPoolExecutor(max_workers=4) as io_pool:
+            for test_id, events in runs.items():
+                tid, result = _eval_one(test_id, events, ground_truth.get(test_id), per_test_dir, db,
+                                        io_pool=io_pool)
+                all_results[tid] = result
+    else:
+        # Each test is independent (own events, own queries, own output
+        # file), so fan the loop out across cores; JSON writes happen in
+        # the workers and overlap with other workers' compute
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+            futures = [
+                ex.submit(_eval_one, tid, evts, ground_truth.get(tid), per_test_dir)
+                for tid, evts in runs.items()
+            ]
+            for f in as_completed(futures):
+                tid, result = f.result()
+                all_results[tid] = result
 
     baseline_results = None
     if baseline_logfile:
@@ -101,16 +171,20 @@ def evaluate(logfile: str, baseline_logfile: str | None = None):
         baseline_results = compare_baselines(all_results, baseline_runs)
 
     out_dir = EVAL_DIR / "output"
+    # Classify each test once; both report generators read the summaries.
+    # Arrays computed by one report stage are shared with the next.
+    summaries = summarize_results(all_results)
+    shared: dict = {}
     report_md_path = out_dir / "report.md"
-    generate_markdown_report(all_results, baseline_results, report_md_path)
+    generate_markdown_report(summaries, baseline_results, report_md_path, shared=shared)
 
     report_html_path = out_dir / "report.html"
     generate_html_report(all_results, report_html_path)
 
     failure_path = out_dir / "failures.md"
-    generate_failure_report(all_results, failure_path)
+    generate_failure_report(summaries, failure_path)
 
-    generate_summary_plots(all_results, out_dir)
+    generate_summary_plots(all_results, out_dir, shared=shared)
 
 
 if __name__ == "__main__":